@@ -98,12 +98,26 @@ DATABASES = {
 if config('DATABASE_URL'):
     DATABASES['default'] = dj_database_url.config(default=config('DATABASE_URL'))
 
+# Connection opened only by `import_scores --engine=native` on MySQL: LOAD DATA
+# LOCAL INFILE needs `local_infile`, which web request connections must not have
+BULK_LOAD_DATABASE = 'bulk_load'
+if DATABASES['default']['ENGINE'] == 'django.db.backends.mysql':
+    DATABASES[BULK_LOAD_DATABASE] = {
+        **DATABASES['default'],
+        'OPTIONS': {**DATABASES['default'].get('OPTIONS', {}), 'local_infile': 1},
+        'TEST': {'MIRROR': 'default'},
+    }
+
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     # Other DRF settings...
 }
 
+# Serve JSON reads of /scores/ from values_list() rows through a precompiled
+# encoder instead of the serializer; the output is byte-for-byte the same
+SCORES_ROW_ENCODER = config('SCORES_ROW_ENCODER', default=True, cast=bool)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -149,3 +163,50 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Memory-mapped columnar score snapshots, rebuilt by `import_scores` and shared by all workers
+SCORE_SNAPSHOT_DIR = config('SCORE_SNAPSHOT_DIR', default=str(BASE_DIR / 'var' / 'snapshots'))
+# Seconds between a write through the API and the snapshot rebuild it schedules
+# (writes in between share the rebuild); negative to rebuild only on import
+SCORE_SNAPSHOT_REBUILD_DELAY = config('SCORE_SNAPSHOT_REBUILD_DELAY', default=10, cast=float)
+
+# Binary columnar exports served by /scores/export/columnar/, one file per dataset version
+SCORE_EXPORT_DIR = config('SCORE_EXPORT_DIR', default=str(BASE_DIR / 'var' / 'exports'))
+
+# Lifetime of cached analytics; entries are keyed by the dataset version, so
+# writes invalidate them immediately and the TTL only bounds memory use
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=24 * 60 * 60, cast=int)
+
+# Analytics are cached in two tiers: a per-process LRU of at most
+# ANALYTICS_L1_MAX_BYTES in front of the shared "analytics" cache below, which
+# all workers see (file-based by default; use DatabaseCache or RedisCache
+# when workers run on several hosts)
+ANALYTICS_CACHE_ALIAS = 'analytics'
+# How long an expired or superseded analytics result may still be served while
+# a single background refresh recomputes it
+ANALYTICS_STALE_SECONDS = config('ANALYTICS_STALE_SECONDS', default=60 * 60, cast=int)
+ANALYTICS_L1_MAX_BYTES = config('ANALYTICS_L1_MAX_BYTES', default=32 * 1024 * 1024, cast=int)
+# Keep analytics responses as rendered JSON plus gzip/brotli variants, served
+# as-is with Content-Encoding; turn off to render every response again
+ANALYTICS_RESPONSE_STORE = config('ANALYTICS_RESPONSE_STORE', default=True, cast=bool)
+# Size of the file-based or database analytics cache.  Django's defaults (300
+# entries, a third culled at random) are far below one dataset version's keys:
+# responses, rankings per combination, limit and page, single-flight pointers.
+# Once full, 1/CULL_FREQUENCY of the entries is dropped; 0 clears it entirely
+ANALYTICS_CACHE_MAX_ENTRIES = config('ANALYTICS_CACHE_MAX_ENTRIES', default=50_000, cast=int)
+ANALYTICS_CACHE_CULL_FREQUENCY = config('ANALYTICS_CACHE_CULL_FREQUENCY', default=10, cast=int)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    ANALYTICS_CACHE_ALIAS: {
+        'BACKEND': config('ANALYTICS_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('ANALYTICS_CACHE_LOCATION', default=str(BASE_DIR / 'var' / 'cache')),
+        'TIMEOUT': ANALYTICS_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': ANALYTICS_CACHE_MAX_ENTRIES,
+            'CULL_FREQUENCY': ANALYTICS_CACHE_CULL_FREQUENCY,
+        },
+    },
+}
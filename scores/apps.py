@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ScoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scores'
+
+    def ready(self):
+        from scores.repositories import request_memo
+
+        request_memo.connect_signals()
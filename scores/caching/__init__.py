@@ -0,0 +1,10 @@
+from .conditional import conditional_on_dataset, dataset_validators
+from .keys import versioned_key
+from .response_store import RenderedResponse, ResponseStore, response_store
+from .single_flight import SingleFlight, single_flight
+from .tiered import LRUCache, TieredCache, analytics_cache
+
+__all__ = [
+    'LRUCache', 'RenderedResponse', 'ResponseStore', 'SingleFlight', 'TieredCache', 'analytics_cache',
+    'conditional_on_dataset', 'dataset_validators', 'response_store', 'single_flight', 'versioned_key',
+]
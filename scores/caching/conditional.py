@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Optional, Tuple
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from scores.repositories import DatasetVersionRepository
+
+
+def request_digest(request) -> str:
+    """Hash of everything besides the data that shapes the response body.
+
+    That is the path and the query parameters (in any order of names),
+    plus the ``Accept`` and ``Accept-Encoding`` headers that pick the
+    renderer and the content coding.
+    """
+    query = sorted(request.GET.lists())
+    raw = repr((
+        request.path, query, request.META.get('HTTP_ACCEPT', ''), request.META.get('HTTP_ACCEPT_ENCODING', ''),
+    )).encode()
+    return hashlib.md5(raw).hexdigest()[:16]
+
+
+def dataset_etag(version: int, digest: str) -> str:
+    return f'"v{version}-{digest}"'
+
+
+def http_timestamp(updated_at: Optional[datetime]) -> Optional[int]:
+    # HTTP dates have whole seconds
+    return int(updated_at.timestamp()) if updated_at else None
+
+
+def dataset_validators(request) -> Tuple[str, Optional[int]]:
+    """Strong ETag and Last-Modified timestamp of a read of the current dataset."""
+    repository = DatasetVersionRepository()
+    return dataset_etag(repository.current(), request_digest(request)), http_timestamp(repository.last_modified())
+
+
+def conditional_on_dataset(view_method: Callable) -> Callable:
+    """Answer ``If-None-Match``/``If-Modified-Since`` of a read endpoint before it runs.
+
+    Decorates a view method.  A GET or HEAD whose validators still match
+    gets a 304 costing one (per-request memoized) read of the dataset
+    version; successful responses carry ``ETag``, ``Last-Modified`` and
+    ``Cache-Control: no-cache`` so clients always revalidate.
+    """
+
+    @wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_method(view, request, *args, **kwargs)
+
+        etag, last_modified = dataset_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        elif not isinstance(response, HttpResponseNotModified):
+            return response
+
+        # A view serving a stored body sets the validators of the version it was built from
+        if not response.has_header('ETag'):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    return wrapper
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Hashable
+
+from scores.repositories import DatasetVersionRepository
+
+
+def versioned_key(namespace: str, *params: Hashable) -> str:
+    """Cache key for *namespace* and *params* under the current dataset version.
+
+    Bumping the version orphans every key of every namespace at once; the
+    orphans simply expire, so no key ever has to be deleted.
+    """
+    digest = hashlib.md5(repr(params).encode()).hexdigest()[:12]
+    return f"{namespace}:v{DatasetVersionRepository().current()}:{digest}"
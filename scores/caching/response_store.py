@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+import brotli
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from scores.repositories import DatasetVersionRepository
+
+from .conditional import dataset_etag, http_timestamp, request_digest
+from .single_flight import SingleFlight, single_flight
+
+# Preferred first; bodies are compressed once, so both use their best ratio
+CODINGS = ('br', 'gzip')
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def django_json(data: Any) -> bytes:
+    """Render *data* exactly like :class:`django.http.JsonResponse`."""
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def compress(body: bytes) -> Dict[str, bytes]:
+    """Compressed variants of *body* by content coding; only those smaller than the body."""
+    variants = {
+        'br': brotli.compress(body, quality=BROTLI_QUALITY),
+        # mtime=0 keeps the output, and so the stored bytes, deterministic
+        'gzip': gzip.compress(body, GZIP_LEVEL, mtime=0),
+    }
+    return {coding: data for coding, data in variants.items() if len(data) < len(body)}
+
+
+def accepted_codings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into ``{coding: q}``."""
+    codings = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """Final bytes of a response, its compressed variants and the validators of its data."""
+
+    content_type: str
+    body: bytes
+    encoded: Dict[str, bytes]
+    version: int
+    last_modified: Optional[int]
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """The stored coding the client prefers, or *None* for the plain body."""
+        codings = accepted_codings(accept_encoding)
+        for coding in CODINGS:
+            if coding in self.encoded and codings.get(coding, codings.get('*', 0.0)) > 0:
+                return coding
+        return None
+
+    def to_response(self, request) -> HttpResponse:
+        coding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        response = HttpResponse(self.encoded[coding] if coding else self.body, content_type=self.content_type)
+        if coding:
+            response['Content-Encoding'] = coding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        # Validators of the data in the body, which may be a stale version
+        response['ETag'] = dataset_etag(self.version, request_digest(request))
+        if self.last_modified is not None:
+            response['Last-Modified'] = http_date(self.last_modified)
+        return response
+
+
+class ResponseStore:
+    """Rendered and pre-compressed analytics responses in the analytics cache.
+
+    Entries are keyed by dataset version and request parameters and go
+    through :class:`SingleFlight`, so a payload is computed, rendered and
+    compressed once per version and every hit is served as stored bytes
+    with no JSON rendering or compression work.
+    """
+
+    NAMESPACE = 'response'
+
+    def __init__(self, flight: Optional[SingleFlight] = None):
+        self._flight = flight
+        self.dataset_version = DatasetVersionRepository()
+
+    @property
+    def flight(self) -> SingleFlight:
+        return self._flight or single_flight()
+
+    def render(self, namespace: str, params: Sequence[Hashable], compute: Callable[[], Any],
+               render: Callable[[Any], bytes], content_type: str = 'application/json',
+               timeout: Optional[float] = None, serve_stale: bool = True) -> RenderedResponse:
+        """Return the stored rendering of ``compute()``, building it on a miss.
+
+        The entry is stamped with the dataset version read before *compute*
+        runs, so *compute* must read current data, not another cache that
+        may answer with an older version.
+        """
+
+        def build() -> RenderedResponse:
+            # Read before computing, so the validators are never newer than the data
+            version = self.dataset_version.current()
+            last_modified = http_timestamp(self.dataset_version.last_modified())
+            body = render(compute())
+            return RenderedResponse(content_type, body, compress(body), version, last_modified)
+
+        return self.flight.get(f"{self.NAMESPACE}:{namespace}", params, build,
+                               timeout=timeout, serve_stale=serve_stale)
+
+    def respond(self, request, namespace: str, params: Sequence[Hashable], compute: Callable[[], Any],
+                render: Optional[Callable[[Any], bytes]] = None, timeout: Optional[float] = None,
+                serve_stale: bool = True):
+        """Serve ``compute()`` for *request* from the store.
+
+        Without *render* the payload is rendered by DRF's ``JSONRenderer``
+        and only plain JSON requests are stored; the browsable API and
+        indented JSON get an ordinary ``Response``.  Exceptions raised by
+        *compute* propagate, and nothing is stored.
+        """
+        if render is None:
+            if getattr(request, 'accepted_media_type', None) != JSONRenderer.media_type:
+                return Response(compute())
+            render = JSONRenderer().render
+        if not settings.ANALYTICS_RESPONSE_STORE:
+            return HttpResponse(render(compute()), content_type='application/json')
+        return self.render(namespace, params, compute, render, timeout=timeout,
+                           serve_stale=serve_stale).to_response(request)
+
+
+_response_store: Optional[ResponseStore] = None
+_response_store_lock = threading.Lock()
+
+
+def response_store() -> ResponseStore:
+    """Return the process-wide :class:`ResponseStore`."""
+    global _response_store
+    if _response_store is None:
+        with _response_store_lock:
+            if _response_store is None:
+                _response_store = ResponseStore()
+    return _response_store
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from django.conf import settings
+from django.db import connections
+
+from scores.repositories import ComputeLockRepository
+
+from .keys import versioned_key
+from .tiered import TieredCache, analytics_cache
+
+logger = logging.getLogger(__name__)
+
+LOCAL_LOCK_STRIPES = 64
+
+
+class SingleFlight:
+    """Coalesce concurrent computations of the same cached result.
+
+    At most one caller per key computes at a time: threads of a process wait
+    on a local lock, and processes take a lease in the database
+    (:class:`ComputeLockRepository`, atomic whatever the cache backend) and
+    poll the cache for the result.  Entries stay fresh for *timeout* seconds and may then be
+    served stale for ``ANALYTICS_STALE_SECONDS`` more while one background
+    thread recomputes them.  A stale read only writes to the database when
+    it starts that refresh: a refresh already running in the process is
+    remembered locally and one running elsewhere is checked with a read.
+    Refresh leases last *refresh_lock_timeout*, so a worker dying mid-refresh
+    delays the next one by that much at most.  When the dataset version changes, the last
+    result of the previous version is served the same way until the new
+    one is ready.
+    """
+
+    def __init__(self, cache: Optional[TieredCache] = None, lock_timeout: float = 60.0,
+                 wait_timeout: float = 30.0, poll_interval: float = 0.05, refresh_lock_timeout: float = 10.0):
+        self._cache = cache
+        self.lock_timeout = lock_timeout
+        self.refresh_lock_timeout = refresh_lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.stale_seconds = settings.ANALYTICS_STALE_SECONDS
+        # Striped, so the number of locks stays bounded however many keys pass
+        self._local_locks = [threading.Lock() for _ in range(LOCAL_LOCK_STRIPES)]
+        self.locks = ComputeLockRepository()
+        # Keys refreshed by a background thread of this process
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+    @property
+    def cache(self) -> TieredCache:
+        return self._cache or analytics_cache()
+
+    def get(self, namespace: str, params: Sequence[Hashable], compute: Callable[[], Any],
+            timeout: Optional[float] = None, serve_stale: bool = True) -> Any:
+        """Return the cached result of *compute* for *namespace* and *params*.
+
+        With *serve_stale* false, expired and superseded results are never
+        returned; concurrent callers still share one computation.
+        """
+        timeout = settings.ANALYTICS_CACHE_TIMEOUT if timeout is None else timeout
+        key = versioned_key(namespace, *params)
+        latest_key = self._latest_key(namespace, params)
+
+        entry = self.cache.get(key)
+        if entry is not None and entry['fresh_until'] > time.time():
+            return entry['value']
+
+        stale = (entry or self.cache.get(latest_key)) if serve_stale else None
+        if stale is not None:
+            # Serve the stale value; at most one caller refreshes it
+            self._start_refresh(key, latest_key, compute, timeout)
+            return stale['value']
+
+        with self._local_lock(key):
+            entry = self.cache.get(key)
+            if entry is not None and entry['fresh_until'] > time.time():
+                return entry['value']
+            token = self._acquire(key)
+            if token:
+                return self._compute(key, latest_key, compute, timeout, token)
+
+        # Another process computes it; poll without holding the stripe, which
+        # other keys share
+        entry = self._wait(key)
+        if entry is not None:
+            return entry['value']
+
+        # The other computation vanished or is too slow; do it here
+        with self._local_lock(key):
+            entry = self.cache.get(key)
+            if entry is not None and entry['fresh_until'] > time.time():
+                return entry['value']
+            return self._compute(key, latest_key, compute, timeout, self._acquire(key))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _latest_key(namespace: str, params: Sequence[Hashable]) -> str:
+        # Not versioned: points at the last result of whatever version computed it
+        digest = hashlib.md5(repr(tuple(params)).encode()).hexdigest()[:12]
+        return f"{namespace}:latest:{digest}"
+
+    def _compute(self, key: str, latest_key: str, compute: Callable[[], Any], timeout: float,
+                 token: Optional[str]) -> Any:
+        try:
+            return self._store(key, latest_key, compute(), timeout)
+        finally:
+            self._release(key, token)
+
+    def _store(self, key: str, latest_key: str, value: Any, timeout: float) -> Any:
+        entry = {'value': value, 'fresh_until': time.time() + timeout}
+        self.cache.set(key, entry, timeout + self.stale_seconds)
+        self.cache.set(latest_key, entry, timeout + self.stale_seconds)
+        return value
+
+    def _start_refresh(self, key: str, latest_key: str, compute: Callable[[], Any], timeout: float) -> None:
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        token = None
+        try:
+            # Checked with a read first, so stale reads do not write while another process refreshes
+            if not self.locks.held(key):
+                token = self.locks.acquire(key, self.refresh_lock_timeout)
+        finally:
+            if not token:
+                self._refreshing.discard(key)
+        if token:
+            threading.Thread(
+                target=self._refresh, args=(key, latest_key, compute, timeout, token), daemon=True,
+            ).start()
+
+    def _refresh(self, key: str, latest_key: str, compute: Callable[[], Any], timeout: float,
+                 token: str) -> None:
+        try:
+            self._store(key, latest_key, compute(), timeout)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            self._release(key, token)
+            self._refreshing.discard(key)
+            connections.close_all()
+
+    def _local_lock(self, key: str) -> threading.Lock:
+        return self._local_locks[hash(key) % LOCAL_LOCK_STRIPES]
+
+    def _acquire(self, key: str) -> Optional[str]:
+        """Take the shared lock of *key*; return its token or *None* if someone holds it."""
+        return self.locks.acquire(key, self.lock_timeout)
+
+    def _release(self, key: str, token: Optional[str]) -> None:
+        if token:
+            self.locks.release(key, token)
+
+    def _wait(self, key: str):
+        """Poll until another process has stored *key*; *None* if its lock went away first."""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+            if not self.locks.held(key):
+                return self.cache.get(key)
+        return None
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def single_flight() -> SingleFlight:
+    """Return the process-wide :class:`SingleFlight` over the analytics cache."""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
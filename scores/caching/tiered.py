@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from scores.repositories import DatasetVersionRepository
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU bounded by the pickled size of its values.
+
+    Values are kept as live objects, so callers must not mutate what they
+    get back.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, size, expires = entry
+            if expires <= time.monotonic():
+                self._remove(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, size: int, timeout: float) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + timeout)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+
+class TieredCache:
+    """In-process LRU (L1) in front of a shared Django cache (L2).
+
+    L2 is the ``ANALYTICS_CACHE_ALIAS`` entry of ``CACHES`` (file-based,
+    database or Redis) and holds pickled values, so their size is known
+    without pickling twice.  L1 is dropped whenever the dataset version
+    differs from the one it was filled under, so a write in any worker
+    reaches every other worker on its next request.
+    """
+
+    def __init__(self, alias: Optional[str] = None, l1_max_bytes: Optional[int] = None):
+        self.alias = alias or settings.ANALYTICS_CACHE_ALIAS
+        self.timeout = settings.ANALYTICS_CACHE_TIMEOUT
+        self.l1 = LRUCache(l1_max_bytes if l1_max_bytes is not None else settings.ANALYTICS_L1_MAX_BYTES)
+        self.dataset_version = DatasetVersionRepository()
+        self._version: Optional[int] = None
+        self._counters = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'sets': 0, 'invalidations': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def l2(self):
+        # ``caches`` hands out one backend instance per thread
+        return caches[self.alias]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._check_version()
+        value = self.l1.get(key)
+        if value is not _MISSING:
+            self._count('l1_hits')
+            return value
+
+        payload = self.l2.get(key)
+        if payload is None:
+            self._count('misses')
+            return default
+        value = pickle.loads(payload)
+        self.l1.set(key, value, len(payload), self.timeout)
+        self._count('l2_hits')
+        return value
+
+    def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        self._check_version()
+        timeout = self.timeout if timeout is None else timeout
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.l2.set(key, payload, timeout)
+        self.l1.set(key, value, len(payload), timeout)
+        self._count('sets')
+
+    def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        self.l2.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this process; L2 hits are L1 misses served by the shared cache."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['l1_hits'] + counters['l2_hits'] + counters['misses']
+        return {
+            **counters,
+            'evictions': self.l1.evictions,
+            'hit_ratio': round((counters['l1_hits'] + counters['l2_hits']) / lookups, 4) if lookups else None,
+            'l1_entries': len(self.l1),
+            'l1_bytes': self.l1.bytes,
+            'l1_max_bytes': self.l1.max_bytes,
+            'dataset_version': self._version,
+            'l2_backend': settings.CACHES[self.alias]['BACKEND'],
+        }
+
+    def _check_version(self) -> None:
+        version = self.dataset_version.current()
+        if version != self._version:
+            with self._lock:
+                if self._version is not None:
+                    self._counters['invalidations'] += 1
+                self._version = version
+            self.l1.clear()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+
+_analytics_cache: Optional[TieredCache] = None
+_analytics_cache_lock = threading.Lock()
+
+
+def analytics_cache() -> TieredCache:
+    """Return the process-wide cache for analytics results."""
+    global _analytics_cache
+    if _analytics_cache is None:
+        with _analytics_cache_lock:
+            if _analytics_cache is None:
+                _analytics_cache = TieredCache()
+    return _analytics_cache
@@ -0,0 +1,14 @@
+from .columnar import ColumnarScores, cached_columnar_export, export_columnar, write_columnar
+from .score_export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, ExportFilter, ScoreExport, gzip_chunks
+
+__all__ = [
+    'ColumnarScores',
+    'EXPORT_CHUNK_SIZE',
+    'EXPORT_FORMATS',
+    'ExportFilter',
+    'ScoreExport',
+    'cached_columnar_export',
+    'export_columnar',
+    'gzip_chunks',
+    'write_columnar',
+]
@@ -0,0 +1,174 @@
+"""Binary columnar export of ``StudentScore`` for analytics consumers.
+
+A file is a fixed prefix, a JSON header and one block per column::
+
+    magic  b"GSCOLS\\0\\0"          8 bytes
+    format uint32 little-endian    FORMAT_VERSION
+    size   uint32 little-endian    length of the JSON header in bytes
+    header JSON, space-padded so the first column starts on a 64-byte boundary
+    columns, each starting on a 64-byte boundary
+
+The header lists ``rows``, the ``dataset_version`` the file was built from
+and, for each column, its ``name``, NumPy ``dtype`` string and byte
+``offset``, so every column can be mapped without parsing anything::
+
+    np.memmap(path, dtype=column["dtype"], mode="r", offset=column["offset"], shape=(header["rows"],))
+
+Rows are sorted by SBD (``sbd`` is fixed-width bytes).  Scores are
+``float32`` with ``NaN`` for a missing score, and ``foreign_lang_code``
+holds indexes into its ``labels`` (``""`` means no code).
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from scores.caching import single_flight
+from scores.models import SUBJECT_FIELDS
+from scores.repositories import DatasetVersionRepository
+from scores.snapshots import read_columns
+
+MAGIC = b'GSCOLS\x00\x00'
+FORMAT_VERSION = 1
+PREFIX = struct.Struct('<8sII')
+ALIGNMENT = 64
+SUFFIX = '.gscol'
+# Cached downloads kept per worker host; a client may still be reading the previous one
+KEEP_EXPORTS = 2
+# Rows converted to Python objects at a time by ``ColumnarScores.iter_rows``
+READ_CHUNK_ROWS = 65_536
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_columnar(path, sbd: np.ndarray, scores: Dict[str, np.ndarray], codes: np.ndarray,
+                   code_labels: List[str], dataset_version: int) -> dict:
+    """Write the columns to *path* atomically and return the header."""
+    width = max(1, int(np.char.str_len(sbd).max())) if len(sbd) else 1
+    columns = [('sbd', sbd.astype(f'S{width}'))]
+    columns += [(subject, np.ascontiguousarray(scores[subject], dtype='<f4')) for subject in SUBJECT_FIELDS]
+    columns.append(('foreign_lang_code', np.ascontiguousarray(codes)))
+
+    header = {
+        'format': FORMAT_VERSION,
+        'dataset_version': dataset_version,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'rows': len(sbd),
+        'missing': 'NaN',
+        'columns': [],
+    }
+    # The offsets depend on the header's size, which depends on the offsets:
+    # lay out with placeholder offsets wide enough for any file, then fill in
+    entries = [{'name': name, 'dtype': array.dtype.str, 'offset': 10 ** 15} for name, array in columns]
+    entries[-1]['labels'] = code_labels
+    header['columns'] = entries
+    offset = _aligned(PREFIX.size + len(json.dumps(header).encode()))
+    for entry, (_, array) in zip(entries, columns):
+        entry['offset'] = offset
+        offset = _aligned(offset + array.nbytes)
+    encoded = json.dumps(header).encode()
+    encoded += b' ' * (entries[0]['offset'] - PREFIX.size - len(encoded))
+
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as fh:
+        fh.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        fh.write(encoded)
+        for entry, (_, array) in zip(entries, columns):
+            fh.write(b'\0' * (entry['offset'] - fh.tell()))
+            fh.write(array.tobytes())
+    os.replace(tmp, path)
+    return header
+
+
+def export_columnar(path) -> dict:
+    """Write the current ``StudentScore`` table to *path*; return the header."""
+    # Read first, so the file never claims a newer version than its rows
+    version = DatasetVersionRepository().current()
+    sbd, scores, codes, code_labels = read_columns()
+    return write_columnar(path, sbd, scores, codes, code_labels, version)
+
+
+class ColumnarScores:
+    """Memory-mapped reader of a columnar export."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as fh:
+            magic, version, size = PREFIX.unpack(fh.read(PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a columnar score export")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported columnar export format {version}")
+            self.header = json.loads(fh.read(size))
+
+        self.rows: int = self.header['rows']
+        self.dataset_version: int = self.header['dataset_version']
+        self.columns = {column['name']: self._map(column) for column in self.header['columns']}
+        self.sbd = self.columns['sbd']
+        self.scores = {subject: self.columns[subject] for subject in SUBJECT_FIELDS}
+        self.codes = self.columns['foreign_lang_code']
+        self.code_labels: List[str] = self.header['columns'][-1]['labels']
+
+    def _map(self, column: dict) -> np.ndarray:
+        if not self.rows:
+            return np.empty(0, dtype=column['dtype'])
+        return np.memmap(self.path, dtype=column['dtype'], mode='r', offset=column['offset'], shape=(self.rows,))
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        """Yield ``(sbd, *scores, foreign_lang_code)`` like ``values_list``, ``None`` for missing.
+
+        Scores are rounded back to hundredths, the precision of exam scores,
+        so they compare equal to the database values.
+        """
+        labels = self.code_labels
+        for start in range(0, self.rows, READ_CHUNK_ROWS):
+            rows = slice(start, start + READ_CHUNK_ROWS)
+            columns = [np.round(self.scores[subject][rows].astype(np.float64), 2).tolist()
+                       for subject in SUBJECT_FIELDS]
+            for sbd, values, code in zip(self.sbd[rows].tolist(), zip(*columns), self.codes[rows].tolist()):
+                yield (sbd.decode(), *(None if value != value else value for value in values), labels[code])
+
+
+def cached_columnar_export(root: Optional[Path] = None) -> Path:
+    """Path of the export of the current dataset version, building it on first use.
+
+    Workers of one host share one build through :class:`SingleFlight`;
+    every host builds into its own export directory.  Older versions beyond
+    ``KEEP_EXPORTS`` are removed.
+    """
+    root = Path(root or settings.SCORE_EXPORT_DIR)
+    path = root / f"scores-v{DatasetVersionRepository().current()}{SUFFIX}"
+    if path.exists():
+        return path
+
+    def build() -> str:
+        if not path.exists():
+            root.mkdir(parents=True, exist_ok=True)
+            export_columnar(path)
+            _prune(root, keep=path)
+        return str(path)
+
+    # The file is local, so the key is too: a path built on another host does not exist here
+    built = Path(single_flight().get('columnar_export', (socket.gethostname(), str(root)), build, serve_stale=False))
+    if not built.exists():
+        # Removed since it was cached, e.g. the export directory was cleaned
+        return Path(build())
+    return built
+
+
+def _prune(root: Path, keep: Path) -> None:
+    exports = sorted(root.glob(f"scores-v*{SUFFIX}"), key=lambda p: int(p.stem.split('-v')[1]))
+    older = [p for p in exports if p != keep]
+    for old in older[:max(0, len(older) - (KEEP_EXPORTS - 1))]:
+        old.unlink(missing_ok=True)
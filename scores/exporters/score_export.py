@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from django.db.models import Q
+
+from scores.importers.reader import CSV_FIELD_MAPPING
+from scores.models import SUBJECT_FIELDS
+from scores.serializers import RowEncoder, StudentScoreSerializer
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+# The import file's layout, so an export can be fed back to ``import_scores``
+CSV_HEADER = ('sbd', *CSV_FIELD_MAPPING)
+CSV_FIELDS = ('r_number', *CSV_FIELD_MAPPING.values())
+
+# Rows fetched per round trip and encoded per yielded chunk
+EXPORT_CHUNK_SIZE = 2000
+MAX_SCORE = 10.0
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    """Rows to export: every listed subject has a score, within ``[min_score, max_score]`` if given."""
+
+    subjects: Tuple[str, ...] = ()
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+
+    @classmethod
+    def parse(cls, subjects: Iterable[str] = (), min_score=None, max_score=None) -> 'ExportFilter':
+        """Build a filter from user input; raise ``ValueError`` if it is invalid."""
+        subjects = tuple(dict.fromkeys(subject.strip() for subject in subjects if subject.strip()))
+        unknown = [subject for subject in subjects if subject not in SUBJECT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown subject(s): {', '.join(unknown)}. Available: {', '.join(SUBJECT_FIELDS)}")
+        bounds = []
+        for name, value in (('min_score', min_score), ('max_score', max_score)):
+            if value in (None, ''):
+                bounds.append(None)
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{name} must be a number")
+            if not 0 <= value <= MAX_SCORE:
+                raise ValueError(f"{name} must be between 0 and {MAX_SCORE:g}")
+            bounds.append(value)
+        if bounds[0] is not None or bounds[1] is not None:
+            if not subjects:
+                raise ValueError("A score range needs at least one subject")
+            if bounds[0] is not None and bounds[1] is not None and bounds[0] > bounds[1]:
+                raise ValueError("min_score must not exceed max_score")
+        return cls(subjects, *bounds)
+
+    def q(self) -> Q:
+        condition = Q()
+        for subject in self.subjects:
+            condition &= Q(**{f"{subject}__isnull": False})
+            if self.min_score is not None:
+                condition &= Q(**{f"{subject}__gte": self.min_score})
+            if self.max_score is not None:
+                condition &= Q(**{f"{subject}__lte": self.max_score})
+        return condition
+
+
+class ScoreExport:
+    """Encode ``StudentScore`` rows as CSV (the import layout) or NDJSON, chunk by chunk.
+
+    NDJSON lines are the rows of the ``/scores/`` API.  Only one chunk of
+    rows is held at a time, so memory does not grow with the table.
+    """
+
+    def __init__(self, output: str = 'csv', chunk_size: int = EXPORT_CHUNK_SIZE):
+        if output not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown output {output!r}. Available: {', '.join(EXPORT_FORMATS)}")
+        self.output = output
+        self.chunk_size = chunk_size
+        self._encoder = RowEncoder(StudentScoreSerializer) if output == 'ndjson' else None
+
+    @property
+    def fields(self) -> Sequence[str]:
+        """Columns, in order, of the rows :meth:`encode` expects."""
+        return self._encoder.sources if self._encoder else CSV_FIELDS
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.output]
+
+    def encode(self, rows: Iterable[tuple]) -> Iterator[bytes]:
+        rows = iter(rows)
+        if self._encoder is None:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            writer.writerow(CSV_HEADER)
+            # ``None`` becomes an empty cell and floats keep their shortest repr, like the source file
+            while batch := list(islice(rows, self.chunk_size)):
+                writer.writerows(batch)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        else:
+            while batch := list(islice(rows, self.chunk_size)):
+                yield ''.join(self._encoder.encode(row) + '\n' for row in batch).encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks into one gzip member on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,22 @@
+from .changes import ChangeSet
+from .checkpoint import ImportCheckpoint
+from .metrics import ImportMetrics, peak_rss_bytes
+from .native_loader import NativeBulkLoader, get_native_loader
+from .reader import ColumnarCsvReader, ScoreChunk, TrackingLineReader, is_plain_file, open_source
+from .sharding import iter_shard_lines, plan_shards
+
+__all__ = [
+    'ChangeSet',
+    'ColumnarCsvReader',
+    'ImportCheckpoint',
+    'ImportMetrics',
+    'NativeBulkLoader',
+    'ScoreChunk',
+    'TrackingLineReader',
+    'get_native_loader',
+    'is_plain_file',
+    'iter_shard_lines',
+    'open_source',
+    'peak_rss_bytes',
+    'plan_shards',
+]
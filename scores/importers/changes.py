@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping, Optional
+
+from scores.models import SUBJECT_FIELDS
+
+
+@dataclass
+class ChangeSet:
+    """SBDs written by an incremental import and the subjects they touched.
+
+    Downstream caches and aggregates use it to refresh only what changed.
+    ``foreign_lang_code`` changes are reported under ``foreign_lang``.
+    """
+
+    inserted: set = field(default_factory=set)
+    updated: set = field(default_factory=set)
+    deleted: set = field(default_factory=set)
+    subjects: set = field(default_factory=set)
+    unchanged: int = 0
+
+    def touch(self, old: Optional[Mapping], new: Optional[Mapping]) -> None:
+        """Record the subjects that differ between two row value mappings."""
+        for subject in SUBJECT_FIELDS:
+            if (old or {}).get(subject) != (new or {}).get(subject):
+                self.subjects.add(subject)
+        if ((old or {}).get('foreign_lang_code') or '') != ((new or {}).get('foreign_lang_code') or ''):
+            self.subjects.add('foreign_lang')
+
+    def merge(self, other: 'ChangeSet') -> None:
+        self.inserted |= other.inserted
+        self.updated |= other.updated
+        self.deleted |= other.deleted
+        self.subjects |= other.subjects
+        self.unchanged += other.unchanged
+
+    @property
+    def changed(self) -> set:
+        return self.inserted | self.updated | self.deleted
+
+    def as_dict(self) -> dict:
+        return {
+            'inserted': sorted(self.inserted),
+            'updated': sorted(self.updated),
+            'deleted': sorted(self.deleted),
+            'subjects': [s for s in SUBJECT_FIELDS if s in self.subjects],
+            'unchanged': self.unchanged,
+        }
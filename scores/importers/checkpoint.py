@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class ImportCheckpoint:
+    """Resume point of an ``import_scores`` run, persisted as a small JSON file.
+
+    It is rewritten (atomically) after every committed batch and records the
+    byte offset and row index reached, the cumulative counters and a SHA-256
+    of the source so a resume against a different file can be refused.
+    """
+
+    def __init__(self, path, source):
+        self.path = Path(path)
+        self.source = Path(source)
+        self._source_hash: Optional[str] = None
+
+    @property
+    def source_hash(self) -> str:
+        if self._source_hash is None:
+            with self.source.open("rb") as fh:
+                self._source_hash = hashlib.file_digest(fh, "sha256").hexdigest()
+        return self._source_hash
+
+    def load(self) -> Optional[dict]:
+        """Return the saved state or *None* if there is no checkpoint."""
+        if not self.path.exists():
+            return None
+        with self.path.open(encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def matches_source(self, state: dict) -> bool:
+        return state.get("source_hash") == self.source_hash
+
+    def save(self, *, offset: int, row: int, created: int, updated: int, errors: int) -> None:
+        state = {
+            "source": str(self.source),
+            "source_hash": self.source_hash,
+            "offset": offset,
+            "row": row,
+            "created": created,
+            "updated": updated,
+            "errors": errors,
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+PHASES = (
+    'read_parse', 'clean', 'lookup', 'bulk_create', 'bulk_update', 'histogram', 'commit',
+    'copy', 'upsert', 'snapshot',
+)
+
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """Peak resident set size of this process (or of its finished children)."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # Linux reports kilobytes, macOS bytes
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+class ImportMetrics:
+    """Timing and throughput counters for one ``import_scores`` run.
+
+    Phase timers are exclusive: time spent in a nested phase (e.g. parsing
+    rows while a native ``copy`` pulls them) is only charged to the inner one.
+    """
+
+    def __init__(self, progress_interval: Optional[float] = 5.0, rolling_window: float = 10.0):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {name: 0.0 for name in PHASES}
+        self.batch_latencies: List[float] = []
+        self.rows = 0
+        self.progress_interval = progress_interval
+        self.rolling_window = rolling_window
+        self._stack: list = []
+        self._samples = deque([(self.started, 0)])
+        self._last_report = self.started
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    @contextmanager
+    def phase(self, name: str):
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - frame[1]
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if self._stack:
+            self._stack[-1][1] += seconds
+
+    def record_batch(self, seconds: float) -> None:
+        self.batch_latencies.append(seconds)
+
+    def record_rows(self, rows: int) -> None:
+        """Set the cumulative number of rows read so far."""
+        self.rows = rows
+        now = time.perf_counter()
+        self._samples.append((now, rows))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.rolling_window:
+            self._samples.popleft()
+
+    def merge(self, other: dict) -> None:
+        """Fold the :meth:`as_dict` report of a worker process into this one."""
+        for name, seconds in other['phases'].items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.batch_latencies.extend(other['batch_latencies'])
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed else 0.0
+
+    def rolling_rows_per_second(self) -> float:
+        (start, start_rows), (end, end_rows) = self._samples[0], self._samples[-1]
+        return (end_rows - start_rows) / (end - start) if end > start else 0.0
+
+    def should_report(self) -> bool:
+        """Return *True* at most once per ``progress_interval`` seconds."""
+        if self.progress_interval is None:
+            return False
+        now = time.perf_counter()
+        if now - self._last_report < self.progress_interval:
+            return False
+        self._last_report = now
+        return True
+
+    def latency_percentiles(self) -> Optional[Dict[str, float]]:
+        if not self.batch_latencies:
+            return None
+        latencies_ms = np.array(self.batch_latencies) * 1000
+        p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+        return {
+            'p50': round(float(p50), 2),
+            'p90': round(float(p90), 2),
+            'p99': round(float(p99), 2),
+            'max': round(float(latencies_ms.max()), 2),
+        }
+
+    def as_dict(self, include_latencies: bool = False) -> dict:
+        """Return the run report; ``include_latencies`` adds the raw batch timings."""
+        phases = {name: round(seconds, 3) for name, seconds in self.phases.items()}
+        report = {
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows': self.rows,
+            'rows_per_second': round(self.rows_per_second(), 1),
+            'rolling_rows_per_second': round(self.rolling_rows_per_second(), 1),
+            'phases': phases,
+            'unaccounted_seconds': round(max(self.elapsed - sum(self.phases.values()), 0.0), 3),
+            'batches': {
+                'count': len(self.batch_latencies),
+                'latency_ms': self.latency_percentiles(),
+            },
+            'peak_rss_bytes': peak_rss_bytes(),
+        }
+        if include_latencies:
+            report['batch_latencies'] = self.batch_latencies
+        return report
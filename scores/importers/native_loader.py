@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import tempfile
+import time
+from contextlib import nullcontext
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from scores.models import CONTENT_FIELDS, StudentScore
+
+from .changes import ChangeSet
+from .metrics import ImportMetrics
+
+# ``(sbd, cleaned_data)`` pairs as produced by the ``import_scores`` command.
+Record = Tuple[str, dict]
+
+STAGING_COLUMN_TYPES = {
+    'foreign_lang_code': 'VARCHAR(15)',
+    'fingerprint': 'BIGINT',
+}
+
+
+def score_columns() -> list[str]:
+    """Return the writable (non-PK, non-generated) ``StudentScore`` columns."""
+    return [
+        field.column for field in StudentScore._meta.concrete_fields
+        if not field.primary_key and not getattr(field, 'generated', False)
+    ]
+
+
+class NativeBulkLoader:
+    """Load records into a staging table, then upsert them in one statement.
+
+    Sub-classes implement the vendor specific pieces: how rows are streamed
+    into the staging table and how the final ``INSERT ... SELECT`` resolves
+    conflicts on ``r_number``.  When the same SBD appears several times in the
+    source the **last** occurrence wins, as with ``--engine=orm`` (with or
+    without ``--incremental``) whether or not the SBD already exists.
+    """
+
+    vendor: str = ''
+    # Settings alias of a dedicated connection to load through, if the vendor needs one
+    database: Optional[str] = None
+    STAGING_TABLE = 'scores_studentscore_staging'
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.table = StudentScore._meta.db_table
+        self.pk_column = StudentScore._meta.pk.column
+        self.columns = score_columns()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def load(self, records: Iterable[Record], changes: Optional[ChangeSet] = None,
+             metrics: Optional[ImportMetrics] = None) -> Tuple[int, int]:
+        """Stream *records* into the database and return ``(created, updated)``.
+
+        With *changes* the load is incremental: staged rows whose fingerprint
+        matches the stored one are dropped before the upsert and the written
+        SBDs / touched subjects are recorded in *changes*.  *metrics* receives
+        the ``copy``, ``upsert`` and ``commit`` phase timings.
+        """
+        phase = metrics.phase if metrics is not None else (lambda name: nullcontext())
+
+        with transaction.atomic(using=self.connection.alias):
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {self._qn(self.STAGING_TABLE)}")
+                cursor.execute(self._create_staging_sql())
+                with phase('copy'):
+                    self._copy_records(cursor, records)
+
+                with phase('upsert'):
+                    if changes is not None:
+                        self._prune_unchanged(cursor, changes)
+
+                    staged, updated = self._count_staged(cursor)
+                    cursor.execute(self._upsert_sql())
+                    cursor.execute(f"DROP TABLE {self._qn(self.STAGING_TABLE)}")
+            commit_started = time.perf_counter()
+        if metrics is not None:
+            metrics.add_phase('commit', time.perf_counter() - commit_started)
+
+        return staged - updated, updated
+
+    # ------------------------------------------------------------------
+    # Vendor hooks
+    # ------------------------------------------------------------------
+    def _copy_records(self, cursor, records: Iterable[Record]) -> None:
+        raise NotImplementedError
+
+    def _upsert_sql(self) -> str:
+        raise NotImplementedError
+
+    def _dedupe_staged_sql(self) -> list[str]:
+        """Statements deleting every staged copy of an SBD but the last one."""
+        staging, pk = self._qn(self.STAGING_TABLE), self._qn(self.pk_column)
+        return [f"DELETE FROM {staging} WHERE row_idx NOT IN (SELECT MAX(row_idx) FROM {staging} GROUP BY {pk})"]
+
+    def _create_staging_sql(self) -> str:
+        score_defs = ", ".join(
+            f"{self._qn(col)} {STAGING_COLUMN_TYPES.get(col, 'DOUBLE PRECISION')}"
+            for col in self.columns
+        )
+        return (
+            f"CREATE TEMPORARY TABLE {self._qn(self.STAGING_TABLE)} ("
+            f"row_idx BIGINT NOT NULL, {self._qn(self.pk_column)} VARCHAR(20) NOT NULL, {score_defs})"
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _qn(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def _staging_columns(self) -> list[str]:
+        return ['row_idx', self.pk_column, *self.columns]
+
+    def _iter_values(self, records: Iterable[Record]):
+        """Yield one tuple per record in staging-column order."""
+        for row_idx, (sbd, cleaned) in enumerate(records):
+            yield (
+                row_idx,
+                sbd,
+                *(
+                    cleaned.get(col, '' if col == 'foreign_lang_code' else None)
+                    for col in self.columns
+                ),
+            )
+
+    def _count_staged(self, cursor) -> Tuple[int, int]:
+        """Return ``(distinct staged SBDs, how many of them already exist)``."""
+        staging, table, pk = self._qn(self.STAGING_TABLE), self._qn(self.table), self._qn(self.pk_column)
+        cursor.execute(f"SELECT COUNT(DISTINCT {pk}) FROM {staging}")
+        staged = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {table} t WHERE EXISTS "
+            f"(SELECT 1 FROM {staging} s WHERE s.{pk} = t.{pk})"
+        )
+        updated = cursor.fetchone()[0]
+        return staged, updated
+
+    def _prune_unchanged(self, cursor, changes: ChangeSet) -> None:
+        """Drop staged rows identical to the stored ones and record the rest."""
+        staging, table, pk = self._qn(self.STAGING_TABLE), self._qn(self.table), self._qn(self.pk_column)
+
+        # Only the last copy of a duplicated SBD is compared, so an unchanged
+        # last copy cannot leave an earlier, different one to be written
+        for sql in self._dedupe_staged_sql():
+            cursor.execute(sql)
+
+        cursor.execute(f"SELECT COUNT(DISTINCT {pk}) FROM {staging}")
+        before = cursor.fetchone()[0]
+        cursor.execute(
+            f"DELETE FROM {staging} WHERE EXISTS (SELECT 1 FROM {table} t "
+            f"WHERE t.{pk} = {staging}.{pk} AND t.fingerprint = {staging}.fingerprint)"
+        )
+        cursor.execute(f"SELECT COUNT(DISTINCT {pk}) FROM {staging}")
+        changes.unchanged += before - cursor.fetchone()[0]
+
+        fields = [self._qn(col) for col in CONTENT_FIELDS]
+        cursor.execute(
+            f"SELECT s.{pk}, t.{pk}, {', '.join(f's.{c}' for c in fields)}, {', '.join(f't.{c}' for c in fields)} "
+            f"FROM {staging} s LEFT JOIN {table} t ON t.{pk} = s.{pk} ORDER BY s.row_idx"
+        )
+        width = len(CONTENT_FIELDS)
+        while rows := cursor.fetchmany(10000):
+            for row in rows:
+                new = dict(zip(CONTENT_FIELDS, row[2:2 + width]))
+                if row[1] is None:
+                    changes.inserted.add(row[0])
+                    changes.touch(None, new)
+                else:
+                    changes.updated.add(row[0])
+                    changes.touch(dict(zip(CONTENT_FIELDS, row[2 + width:])), new)
+
+
+class PostgresCopyLoader(NativeBulkLoader):
+    """PostgreSQL: ``COPY ... FROM STDIN`` + ``INSERT ... ON CONFLICT``."""
+
+    vendor = 'postgresql'
+
+    def _copy_records(self, cursor, records: Iterable[Record]) -> None:
+        columns = ", ".join(self._qn(col) for col in self._staging_columns())
+        # ``cursor.copy`` is psycopg 3's streaming COPY API.
+        with cursor.copy(f"COPY {self._qn(self.STAGING_TABLE)} ({columns}) FROM STDIN") as copy:
+            for values in self._iter_values(records):
+                copy.write_row(values)
+
+    def _upsert_sql(self) -> str:
+        pk = self._qn(self.pk_column)
+        columns = ", ".join(self._qn(col) for col in [self.pk_column, *self.columns])
+        updates = ", ".join(f"{self._qn(col)} = EXCLUDED.{self._qn(col)}" for col in self.columns)
+        # DISTINCT ON keeps the last occurrence of duplicated SBDs, otherwise
+        # ON CONFLICT would refuse to touch the same row twice.
+        return (
+            f"INSERT INTO {self._qn(self.table)} ({columns}) "
+            f"SELECT DISTINCT ON ({pk}) {columns} FROM {self._qn(self.STAGING_TABLE)} "
+            f"ORDER BY {pk}, row_idx DESC "
+            f"ON CONFLICT ({pk}) DO UPDATE SET {updates}"
+        )
+
+
+class MySQLLoadDataLoader(NativeBulkLoader):
+    """MySQL / MariaDB: ``LOAD DATA LOCAL INFILE`` + ``ON DUPLICATE KEY UPDATE``.
+
+    MySQL cannot read ``LOCAL INFILE`` from a pipe, so rows are spooled to a
+    temporary TSV file first.  Both the client and the server
+    (``local_infile=ON``) must allow it; the client option is only set on
+    the ``BULK_LOAD_DATABASE`` connection, never on ``default``.
+    """
+
+    vendor = 'mysql'
+    database = settings.BULK_LOAD_DATABASE
+
+    def _create_staging_sql(self) -> str:
+        return super()._create_staging_sql().replace('DOUBLE PRECISION', 'DOUBLE')
+
+    def _dedupe_staged_sql(self) -> list[str]:
+        # A temporary table can be opened only once per statement, so the
+        # last copies are collected into a second one first
+        staging, pk = self._qn(self.STAGING_TABLE), self._qn(self.pk_column)
+        last = self._qn(f'{self.STAGING_TABLE}_last')
+        return [
+            f"DROP TEMPORARY TABLE IF EXISTS {last}",
+            f"CREATE TEMPORARY TABLE {last} (PRIMARY KEY ({pk})) "
+            f"SELECT {pk}, MAX(row_idx) AS row_idx FROM {staging} GROUP BY {pk}",
+            f"DELETE s FROM {staging} s LEFT JOIN {last} l ON l.{pk} = s.{pk} AND l.row_idx = s.row_idx "
+            f"WHERE l.{pk} IS NULL",
+            f"DROP TEMPORARY TABLE {last}",
+        ]
+
+    def _copy_records(self, cursor, records: Iterable[Record]) -> None:
+        columns = ", ".join(self._qn(col) for col in self._staging_columns())
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.tsv', newline='\n') as fh:
+            for values in self._iter_values(records):
+                fh.write("\t".join(self._tsv_value(v) for v in values))
+                fh.write("\n")
+            fh.flush()
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {self._qn(self.STAGING_TABLE)} "
+                f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                f"({columns})",
+                [fh.name],
+            )
+
+    def _upsert_sql(self) -> str:
+        columns = ", ".join(self._qn(col) for col in [self.pk_column, *self.columns])
+        updates = ", ".join(f"{self._qn(col)} = VALUES({self._qn(col)})" for col in self.columns)
+        # Rows are applied in file order, so the last duplicate wins.
+        return (
+            f"INSERT INTO {self._qn(self.table)} ({columns}) "
+            f"SELECT {columns} FROM {self._qn(self.STAGING_TABLE)} ORDER BY row_idx "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
+    @staticmethod
+    def _tsv_value(value) -> str:
+        if value is None:
+            return r"\N"
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+        )
+
+
+NATIVE_LOADERS = {
+    loader.vendor: loader for loader in (PostgresCopyLoader, MySQLLoadDataLoader)
+}
+
+
+def get_native_loader(connection) -> Optional[NativeBulkLoader]:
+    """Return a loader for *connection* or *None* if the vendor has no native path.
+
+    Vendors naming a ``database`` load through that connection instead.
+    """
+    loader_class = NATIVE_LOADERS.get(connection.vendor)
+    if loader_class is None:
+        return None
+    if loader_class.database in connections.settings:
+        connection = connections[loader_class.database]
+    return loader_class(connection)
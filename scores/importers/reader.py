@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import sys
+import zipfile
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# CSV column to model field mapping
+CSV_FIELD_MAPPING = {
+    'toan': 'math',
+    'ngu_van': 'literature',
+    'ngoai_ngu': 'foreign_lang',
+    'vat_li': 'physics',
+    'hoa_hoc': 'chemistry',
+    'sinh_hoc': 'biology',
+    'lich_su': 'history',
+    'dia_li': 'geography',
+    'gdcd': 'civic_education',
+    'ma_ngoai_ngu': 'foreign_lang_code',
+}
+
+STDIN_SOURCE = '-'
+COMPRESSED_SUFFIXES = ('.gz', '.zip')
+
+
+def open_source(path) -> BinaryIO:
+    """Open a CSV source for binary reading.
+
+    ``-`` reads standard input, ``*.gz`` is decompressed on the fly and for
+    ``*.zip`` the first ``.csv`` member of the archive is streamed.
+    """
+    path = str(path)
+    if path == STDIN_SOURCE:
+        return sys.stdin.buffer
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zip'):
+        archive = zipfile.ZipFile(path)
+        members = [name for name in archive.namelist() if name.lower().endswith('.csv')]
+        return archive.open((members or archive.namelist())[0])
+    return open(path, 'rb')
+
+
+def is_plain_file(path) -> bool:
+    """Return *True* if *path* is an uncompressed file that supports byte ranges."""
+    path = str(path)
+    return path != STDIN_SOURCE and not path.endswith(COMPRESSED_SUFFIXES)
+
+
+class TrackingLineReader:
+    """Iterate the decoded lines of a binary stream while tracking the byte offset.
+
+    ``position`` is the offset just past the last line handed out, so after a
+    chunk of rows has been read it is exactly where the next chunk starts.
+    """
+
+    def __init__(self, fh: BinaryIO, encoding: str = "utf-8"):
+        self.fh = fh
+        self.encoding = encoding
+        self.position = 0
+
+    def seek(self, offset: int) -> None:
+        self.fh.seek(offset)
+        self.position = offset
+
+    def read_header(self) -> List[str]:
+        """Consume the header line (dropping a UTF-8 BOM) and return the column names."""
+        line = next(self, "").lstrip("\ufeff")
+        return [name.strip() for name in next(csv.reader([line]), [])]
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        line = self.fh.readline()
+        if not line:
+            raise StopIteration
+        self.position += len(line)
+        return line.decode(self.encoding)
+
+
+class ScoreChunk:
+    """Column-oriented block of CSV rows.
+
+    Scores are ``float64`` arrays with ``NaN`` for blanks; ``sbds`` and
+    ``codes`` stay plain string lists.  ``end_offset`` is the byte offset after
+    the chunk when the source tracks it.
+    """
+
+    def __init__(self, first_row: int, sbds: List[str], scores: Dict[str, np.ndarray],
+                 codes: Optional[List[str]], end_offset: Optional[int] = None):
+        self.first_row = first_row
+        self.sbds = sbds
+        self.scores = scores
+        self.codes = codes
+        self.end_offset = end_offset
+
+    def __len__(self) -> int:
+        return len(self.sbds)
+
+    @property
+    def last_row(self) -> int:
+        return self.first_row + len(self.sbds) - 1
+
+    def records(self) -> Iterator[tuple]:
+        """Yield ``(row_number, sbd, cleaned_data)`` with ``None`` for missing scores."""
+        fields = list(self.scores)
+        columns = []
+        for field in fields:
+            values = self.scores[field]
+            column = values.astype(object)
+            column[np.isnan(values)] = None
+            columns.append(column.tolist())
+
+        if self.codes is not None:
+            fields.append('foreign_lang_code')
+            columns.append(self.codes)
+
+        for offset, (sbd, values) in enumerate(zip(self.sbds, zip(*columns))):
+            yield self.first_row + offset, sbd, dict(zip(fields, values))
+
+
+class ColumnarCsvReader:
+    """Read THPT score CSV lines in chunks and parse them column by column.
+
+    Each chunk is handed to :func:`numpy.loadtxt` in one call, so the nine
+    score columns are converted to floats in C instead of one ``float()`` per
+    value; blank scores become ``NaN`` and blank text columns stay empty.
+    Chunks that ``loadtxt`` rejects (stray text in a score column, ragged
+    rows) fall back to :mod:`csv` with per-value cleaning.
+    """
+
+    def __init__(self, lines: Iterable[str], fieldnames: List[str], chunk_rows: int = 5000,
+                 first_row: int = 1):
+        self.lines = lines
+        self.fieldnames = fieldnames
+        self.chunk_rows = chunk_rows
+        self.next_row = first_row
+
+        self.sbd_index = fieldnames.index('sbd')
+        self.score_columns = {
+            fieldnames.index(col): field for col, field in CSV_FIELD_MAPPING.items()
+            if col in fieldnames and field != 'foreign_lang_code'
+        }
+        self.code_index = fieldnames.index('ma_ngoai_ngu') if 'ma_ngoai_ngu' in fieldnames else None
+
+    def __iter__(self) -> Iterator[ScoreChunk]:
+        lines = iter(self.lines)
+        while True:
+            raw_lines = list(islice(lines, self.chunk_rows))
+            if not raw_lines:
+                return
+            chunk_lines = [line for line in raw_lines if line.strip()]
+            if not chunk_lines:
+                continue
+            try:
+                chunk = self._parse_columnar(chunk_lines)
+            except ValueError:
+                chunk = self._parse_rows(chunk_lines)
+            chunk.end_offset = getattr(self.lines, 'position', None)
+            self.next_row += len(chunk)
+            yield chunk
+
+    # ------------------------------------------------------------------
+    # Parsers
+    # ------------------------------------------------------------------
+    def _parse_columnar(self, lines: List[str]) -> ScoreChunk:
+        text = "".join(lines).replace("\r\n", "\n")
+        if not text.endswith("\n"):
+            text += "\n"
+
+        options = dict(delimiter=",", quotechar='"', comments=None, ndmin=2)
+        score_indexes = list(self.score_columns)
+        string_indexes = [self.sbd_index] + ([self.code_index] if self.code_index is not None else [])
+
+        if not score_indexes:
+            matrix = np.empty((len(lines), 0))
+        elif '"' in text:
+            # A quoted field may hold commas: convert blank scores per column instead
+            converters = {index: _parse_blank_score for index in score_indexes}
+            matrix = np.loadtxt(io.StringIO(text), usecols=score_indexes, dtype=np.float64,
+                                converters=converters, **options)
+        else:
+            # Without quotes every blank field is a blank score or text column: "nan"
+            # lets the C parser convert the scores; text columns are read from *text*
+            filled = ("\n" + text).replace(",,", ",nan,").replace(",,", ",nan,")
+            filled = filled.replace("\n,", "\nnan,").replace(",\n", ",nan\n")[1:]
+            matrix = np.loadtxt(io.StringIO(filled), usecols=score_indexes, dtype=np.float64, **options)
+        strings = np.char.strip(
+            np.loadtxt(io.StringIO(text), usecols=string_indexes, dtype=str, **options)
+        )
+        if len(matrix) != len(lines) or len(strings) != len(lines):
+            raise ValueError("row count mismatch")
+
+        codes = strings[:, 1].tolist() if self.code_index is not None else None
+
+        return ScoreChunk(
+            first_row=self.next_row,
+            sbds=strings[:, 0].tolist(),
+            scores={field: matrix[:, i] for i, field in enumerate(self.score_columns.values())},
+            codes=codes,
+        )
+
+    def _parse_rows(self, lines: List[str]) -> ScoreChunk:
+        sbds: List[str] = []
+        scores: Dict[str, list] = {field: [] for field in self.score_columns.values()}
+        codes: List[str] = []
+
+        for row in csv.reader(lines):
+            row = (row + [""] * len(self.fieldnames))[:len(self.fieldnames)]
+            sbds.append(row[self.sbd_index].strip())
+            for index, field in self.score_columns.items():
+                scores[field].append(parse_score(row[index]))
+            if self.code_index is not None:
+                codes.append((row[self.code_index] or "").strip())
+
+        return ScoreChunk(
+            first_row=self.next_row,
+            sbds=sbds,
+            scores={field: np.array(values, dtype=np.float64) for field, values in scores.items()},
+            codes=codes if self.code_index is not None else None,
+        )
+
+
+def _parse_blank_score(value: str) -> float:
+    """``loadtxt`` converter: ``NaN`` for a blank score, ``ValueError`` for text."""
+    return float(value) if value.strip() else float("nan")
+
+
+def parse_score(value) -> float:
+    """Parse one CSV score, returning ``NaN`` for blank or invalid values."""
+    if value and str(value).strip():
+        try:
+            return float(str(value).strip())
+        except (ValueError, TypeError):
+            pass
+    return float("nan")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+from typing import BinaryIO, Iterator, List, Tuple
+
+# ``(start, end)`` byte offsets; a shard owns every line that *starts* in it.
+Shard = Tuple[int, int]
+
+
+def plan_shards(path, count: int) -> List[Shard]:
+    """Split the data rows of the CSV at *path* into *count* byte ranges.
+
+    The header line is excluded and every boundary is moved forward to the
+    start of the next line, so no row is ever split between two shards.  Rows
+    must not contain quoted line breaks (the THPT export never does).
+    """
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as fh:
+        fh.readline()  # header
+        data_start = fh.tell()
+
+        step = max((size - data_start) // max(count, 1), 1)
+        boundaries = [data_start]
+        for i in range(1, count):
+            offset = data_start + i * step
+            if offset >= size:
+                break
+            fh.seek(offset - 1)
+            fh.readline()  # finish the line that straddles the boundary
+            if fh.tell() > boundaries[-1]:
+                boundaries.append(fh.tell())
+
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+
+
+def iter_shard_lines(fh: BinaryIO, start: int, end: int, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield decoded lines of the binary file *fh* that start inside ``[start, end)``."""
+    fh.seek(start)
+    position = start
+    while position < end:
+        line = fh.readline()
+        if not line:
+            break
+        position += len(line)
+        yield line.decode(encoding)
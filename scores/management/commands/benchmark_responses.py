@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.utils.text import compress_string
+
+DEFAULT_URLS = (
+    "/api/v1/score-report/",
+    "/api/v1/score-report/chart-data/",
+    "/api/v1/score-report/subject/math/",
+    "/api/v1/dashboard/summary/",
+    "/api/v1/top-students/a00/?limit=50",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare analytics endpoints rendered on every request with the same endpoints served "
+        "from the pre-rendered, pre-compressed response store"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", help=f"Paths to request (default: {', '.join(DEFAULT_URLS)})")
+        parser.add_argument("--requests", type=int, default=500, help="Timed requests per URL and mode")
+        parser.add_argument(
+            "--accept-encoding", default="gzip, deflate, br",
+            help="Accept-Encoding sent by the client; rendered responses are gzipped per request "
+                 "like GZipMiddleware would when it accepts gzip",
+        )
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_ACCEPT_ENCODING=options["accept_encoding"])
+        n = options["requests"]
+        gzip_rendered = "gzip" in options["accept_encoding"]
+
+        self.stdout.write(f"{'endpoint':<45} {'mode':<8} {'req/s':>9} {'CPU µs/req':>11} {'bytes':>8}")
+        with override_settings(ALLOWED_HOSTS=["testserver", *settings.ALLOWED_HOSTS]):
+            for url in options["urls"] or DEFAULT_URLS:
+                with override_settings(ANALYTICS_RESPONSE_STORE=False):
+                    rendered = self._measure(client, url, n, gzip_rendered)
+                stored = self._measure(client, url, n, False)
+                for mode, (rate, cpu, size) in (("render", rendered), ("stored", stored)):
+                    self.stdout.write(f"{url:<45} {mode:<8} {rate:>9.0f} {cpu:>11.0f} {size:>8}")
+                saved = 1 - stored[1] / rendered[1] if rendered[1] else 0.0
+                self.stdout.write(self.style.SUCCESS(f"{'':<45} saved {saved:.0%} of the CPU per request"))
+
+    @staticmethod
+    def _measure(client, url, n, compress):
+        # Warm the analytics cache (and the store) so only the serving cost is timed
+        response = client.get(url)
+        for _ in range(5):
+            client.get(url)
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        for _ in range(n):
+            response = client.get(url)
+            body = compress_string(response.content) if compress else response.content
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        return n / wall, cpu / n * 1e6, len(body)
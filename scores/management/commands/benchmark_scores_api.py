@@ -0,0 +1,64 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from ...models import StudentScore
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec of /scores/ list and detail reads through the serializer and through "
+        "the values_list row encoder, and check both return the same bytes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario and mode")
+        parser.add_argument("--seed", type=int, default=0, help="Seed for picking pages and students")
+
+    def handle(self, *args, **options):
+        sbds = list(StudentScore.objects.order_by("r_number").values_list("r_number", flat=True)[:10_000])
+        if not sbds:
+            raise CommandError("No scores to read; run import_scores first")
+        count = StudentScore.objects.count()
+        pages = max(1, -(-count // settings.REST_FRAMEWORK["PAGE_SIZE"]))
+
+        rng = random.Random(options["seed"])
+        n = options["requests"]
+        scenarios = {
+            "list, first page": ["/api/v1/scores/"] * n,
+            "list, random page": [f"/api/v1/scores/?page={rng.randint(1, pages)}" for _ in range(n)],
+            "retrieve": [f"/api/v1/scores/{rng.choice(sbds)}/" for _ in range(n)],
+        }
+
+        client = Client()
+        self.stdout.write(f"{'scenario':<20} {'serializer req/s':>17} {'row encoder req/s':>18} {'speedup':>8}")
+        with override_settings(ALLOWED_HOSTS=["testserver", *settings.ALLOWED_HOSTS]):
+            scenarios["list, cursor walk"] = self._cursor_walk(client, n)
+            for name, urls in scenarios.items():
+                with override_settings(SCORES_ROW_ENCODER=False):
+                    before, expected = self._measure(client, urls)
+                after, actual = self._measure(client, urls)
+                if actual != expected:
+                    raise CommandError(f"{name}: the row encoder returned different bytes")
+                self.stdout.write(f"{name:<20} {before:>17.0f} {after:>18.0f} {after / before:>7.1f}x")
+        self.stdout.write(self.style.SUCCESS("Responses were byte-for-byte identical"))
+
+    @staticmethod
+    def _cursor_walk(client, n):
+        urls, url = [], "/api/v1/scores/?cursor="
+        while url and len(urls) < n:
+            urls.append(url)
+            url = client.get(url).json()["next"]
+        return urls
+
+    @staticmethod
+    def _measure(client, urls):
+        client.get(urls[0])
+        bodies = []
+        started = time.perf_counter()
+        for url in urls:
+            bodies.append(client.get(url).content)
+        return len(urls) / (time.perf_counter() - started), bodies
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ...snapshots import build_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write a memory-mapped columnar snapshot of StudentScore and make it the current one"
+
+    def handle(self, *args, **options):
+        snapshot = build_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot v{snapshot.version} published at {snapshot.path} ({snapshot.rows} rows)"
+        ))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import COMBINATIONS
+from ...services.top_student_service import TopStudentScoreService
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan of the top-N ranking query of every combination and check "
+        "that it reads the combination's descending index"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("groups", nargs="*", help="Combination codes (default: all)")
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--min-subjects", type=int, default=2)
+        parser.add_argument(
+            "--strict", action="store_true",
+            help="Fail if a plan does not use the index (the planner may prefer a scan on small tables)",
+        )
+
+    def handle(self, *args, **options):
+        service = TopStudentScoreService()
+        codes = [code.upper() for code in options["groups"]] or list(COMBINATIONS)
+        unknown = [code for code in codes if code not in COMBINATIONS]
+        if unknown:
+            raise CommandError(f"Unknown combination(s): {', '.join(unknown)}")
+
+        missing = []
+        for code in codes:
+            combination = COMBINATIONS[code]
+            plan = service.ranking_queryset(combination, options["min_subjects"])[:options["limit"]].explain()
+            uses_index = combination.index_name in plan
+            if not uses_index:
+                missing.append(code)
+
+            style = self.style.SUCCESS if uses_index else self.style.WARNING
+            self.stdout.write(style(f"{code}: {'index ' + combination.index_name if uses_index else 'no index'}"))
+            if options["verbosity"] >= 2 or not uses_index:
+                self.stdout.write(plan)
+
+        if missing and options["strict"]:
+            raise CommandError(f"Ranking index not used for: {', '.join(missing)}")
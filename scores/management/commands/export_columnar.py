@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from ...exporters import ColumnarScores, export_columnar
+
+
+class Command(BaseCommand):
+    help = (
+        "Write StudentScore as a binary columnar file: float32 scores (NaN = missing), "
+        "dictionary-encoded foreign_lang_code and SBDs, behind a JSON header for np.memmap"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, e.g. scores.gscol")
+
+    def handle(self, *args, **options):
+        header = export_columnar(options["path"])
+        exported = ColumnarScores(options["path"])
+        columns = ", ".join(f"{column['name']}:{column['dtype']}" for column in header["columns"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {exported.rows} rows of dataset v{exported.dataset_version} to {options['path']} ({columns})"
+        ))
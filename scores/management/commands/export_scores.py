@@ -0,0 +1,60 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...exporters import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, ExportFilter, ScoreExport, gzip_chunks
+from ...importers import peak_rss_bytes
+from ...services import StudentScoreService
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream StudentScore to a CSV file in the import layout (re-importable with import_scores) "
+        "or to NDJSON, optionally gzipped and filtered by subject and score range"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, or '-' for stdout; a .gz suffix compresses it")
+        parser.add_argument("--output", choices=EXPORT_FORMATS, default="csv", help="Output format (default: csv)")
+        parser.add_argument("--gzip", action="store_true", help="Compress the output (implied by a .gz path)")
+        parser.add_argument(
+            "--subject", action="append", default=[],
+            help="Only students with a score in this subject; repeat for several",
+        )
+        parser.add_argument("--min-score", type=float, help="Lowest score to keep in every --subject")
+        parser.add_argument("--max-score", type=float, help="Highest score to keep in every --subject")
+        parser.add_argument(
+            "--chunk-size", type=int, default=EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched and written at a time (default: {EXPORT_CHUNK_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            export = ScoreExport(options["output"], options["chunk_size"])
+            filters = ExportFilter.parse(options["subject"], options["min_score"], options["max_score"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        path = options["path"]
+        chunks = StudentScoreService().export(export, filters)
+        if options["gzip"] or path.endswith(".gz"):
+            chunks = gzip_chunks(chunks)
+
+        started = time.perf_counter()
+        written = 0
+        out = sys.stdout.buffer if path == "-" else open(path, "wb")
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+
+        if path != "-":
+            rss = peak_rss_bytes()
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote {written:,} bytes to {path} in {time.perf_counter() - started:.1f}s"
+                + (f" (peak RSS {rss / 2**20:.0f} MiB)" if rss else "")
+            ))
@@ -1,24 +1,48 @@
 # from __future__ import annotations
 
 import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import django
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import DatabaseError, connection, connections, transaction
 from django.conf import settings
 
-from ...models import StudentScore
+from ...importers import (
+    ChangeSet,
+    ColumnarCsvReader,
+    ImportCheckpoint,
+    ImportMetrics,
+    TrackingLineReader,
+    get_native_loader,
+    is_plain_file,
+    iter_shard_lines,
+    open_source,
+    peak_rss_bytes,
+    plan_shards,
+)
+from ...importers.reader import STDIN_SOURCE
+from ...models import CONTENT_FIELDS, StudentScore, compute_fingerprint
+from ...repositories import DatasetVersionRepository, ScoreHistogramRepository
+from ...repositories.score_histogram_repository import score_values
+from ...snapshots import build_snapshot, invalidate_snapshot
 
 
 class Command(BaseCommand):
     help = "Import THPT 2024 student scores from a CSV file"
 
+    # Set in ``--workers`` processes, where a database error fails the whole shard
+    in_shard = False
+
     def add_arguments(self, parser):
         parser.add_argument(
             "csv_path",
             nargs="?",
             default=str(Path(__file__).resolve().parent.parent / "data" / "diem_thi_thpt_2024.csv"),
-            help="Path to CSV file (default: built-in data directory)",
+            help="Path to a CSV, .csv.gz or .zip file, or '-' for stdin (default: built-in data directory)",
         )
         parser.add_argument(
             "--truncate",
@@ -29,18 +53,82 @@ class Command(BaseCommand):
             "--batch-size",
             type=int,
             default=5000,  # Increased default for bulk operations
-            help="Batch size for bulk operations (default: 5000)",
+            help="Rows parsed per chunk and written per bulk operation (default: 5000)",
         )
         parser.add_argument(
             "--dry-run",
             action="store_true",
             help="Run without actually saving to database",
         )
+        parser.add_argument(
+            "--engine",
+            choices=["orm", "native"],
+            default="orm",
+            help=(
+                "Write path: 'orm' uses bulk_create/bulk_update per batch, 'native' streams rows "
+                "into a staging table (PostgreSQL COPY / MySQL LOAD DATA) and upserts them in one "
+                "statement. Falls back to 'orm' on other databases (default: orm)"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Split the CSV into line-aligned byte ranges and import them in N processes, "
+                "each with its own database connection (default: 1)"
+            ),
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Compare rows against their stored content fingerprint and only write new or changed SBDs.",
+        )
+        parser.add_argument(
+            "--delete-missing",
+            action="store_true",
+            help="With --incremental, delete StudentScore rows whose SBD is not in the CSV.",
+        )
+        parser.add_argument(
+            "--changes-out",
+            metavar="PATH",
+            help="With --incremental, write the changed SBDs and touched subjects to PATH as JSON.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            metavar="PATH",
+            help="Where to persist the resume point after each batch (default: <csv_path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted import from its checkpoint. Refused if the CSV has changed.",
+        )
+        parser.add_argument(
+            "--skip-snapshot",
+            action="store_true",
+            help="Do not rebuild the memory-mapped score snapshot after the import (the old one is retired).",
+        )
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=5.0,
+            metavar="SECONDS",
+            help="Print a progress line at most every SECONDS seconds (default: 5)",
+        )
+        parser.add_argument(
+            "--report-json",
+            metavar="PATH",
+            help="Write phase timings, throughput, batch latency percentiles and peak RSS to PATH as JSON.",
+        )
 
     def handle(self, *args, **options):
-        csv_path = Path(options["csv_path"]).expanduser().resolve()
-        if not csv_path.exists():
-            raise CommandError(f"CSV file not found: {csv_path}")
+        self.verbosity = options["verbosity"]
+        csv_path = options["csv_path"]
+        if csv_path != STDIN_SOURCE:
+            csv_path = Path(csv_path).expanduser().resolve()
+            if not csv_path.exists():
+                raise CommandError(f"CSV file not found: {csv_path}")
 
         # Debug database connection
         self.stdout.write(f"Database engine: {settings.DATABASES['default']['ENGINE']}")
@@ -49,92 +137,152 @@ class Command(BaseCommand):
         if options["dry_run"]:
             self.stdout.write(self.style.WARNING("DRY RUN MODE - No data will be saved"))
 
+        if (options["delete_missing"] or options["changes_out"]) and not options["incremental"]:
+            raise CommandError("--delete-missing and --changes-out require --incremental")
+
+        if options["workers"] > 1 and connection.vendor == "sqlite":
+            # SQLite has a single writer lock: the workers would mostly fail with "database is locked"
+            self.stdout.write(self.style.WARNING("SQLite allows one writer at a time; importing in a single process"))
+            options["workers"] = 1
+
+        if options["workers"] > 1 and not is_plain_file(csv_path):
+            raise CommandError("--workers needs an uncompressed CSV file")
+        if options["delete_missing"] and csv_path == STDIN_SOURCE:
+            raise CommandError("--delete-missing cannot read the CSV twice from stdin")
+
+        self._setup_checkpoint(csv_path, options)
+
+        # Rows inserted, updated or deleted by this run; with none, the dataset
+        # version, caches and snapshot are left alone
+        self.rows_written = 0
+        self.version_bumped = False
+
         if options["truncate"] and not options["dry_run"]:
             self.stdout.write("Truncating existing StudentScore data …")
             deleted_count = StudentScore.objects.all().delete()[0]
+            ScoreHistogramRepository().reset()
+            self.rows_written += deleted_count
             self.stdout.write(f"Deleted {deleted_count} existing records")
 
         self.stdout.write(f"Importing scores from {csv_path} …")
 
-        # Read and validate CSV first
         try:
-            with csv_path.open(newline="", encoding="utf-8") as fh:
-                reader = csv.DictReader(fh)
-                headers = reader.fieldnames
-                self.stdout.write(f"CSV headers: {headers}")
-
-                if not headers or 'sbd' not in headers:
-                    raise CommandError("CSV must contain 'sbd' column")
-
-                # Process in batches
-                self._process_csv_data(csv_path, options)
-
-        except UnicodeDecodeError:
-            self.stdout.write(self.style.ERROR("Trying different encoding..."))
-            try:
-                with csv_path.open(newline="", encoding="utf-8-sig") as fh:
-                    self._process_csv_data(csv_path, options)
-            except Exception as e:
-                raise CommandError(f"Failed to read CSV with UTF-8-BOM: {e}")
+            self._process_csv_data(csv_path, options)
+        except CommandError:
+            raise
         except Exception as e:
             raise CommandError(f"Error reading CSV: {e}")
+        finally:
+            if not options["dry_run"] and self.rows_written and not self.version_bumped:
+                # Committed batches are visible even if the run failed; every
+                # cached result computed before them is now stale
+                DatasetVersionRepository().bump()
+
+    def _setup_checkpoint(self, csv_path, options):
+        """Create ``self.checkpoint`` and load ``self.resume_state`` for ``--resume``."""
+        self.checkpoint = None
+        self.resume_state = None
+
+        # Native loads and sharded runs are not resumable: the former is a
+        # single transaction, the latter has no single resume offset.
+        native = options["engine"] == "native" and get_native_loader(connection) is not None
+        if not options["dry_run"] and not native and options["workers"] <= 1 and csv_path != STDIN_SOURCE:
+            self.checkpoint = ImportCheckpoint(
+                options["checkpoint"] or f"{csv_path}.checkpoint", csv_path
+            )
+
+        if not options["resume"]:
+            return
+
+        if self.checkpoint is None:
+            raise CommandError("--resume is only supported by single-process ORM imports from a file")
+        if options["truncate"]:
+            raise CommandError("--resume cannot be combined with --truncate")
+
+        state = self.checkpoint.load()
+        if state is None:
+            raise CommandError(f"No checkpoint found at {self.checkpoint.path}")
+        if not self.checkpoint.matches_source(state):
+            raise CommandError(
+                f"{csv_path} has changed since the checkpoint was written; refusing to resume"
+            )
+
+        self.resume_state = state
+        self.stdout.write(f"Resuming after row {state['row']} (byte offset {state['offset']})")
+        if options["changes_out"]:
+            self.stdout.write(self.style.WARNING(
+                "The change set only covers rows written after the checkpoint"
+            ))
 
     def _process_csv_data(self, csv_path, options):
-        created = 0
-        updated = 0
-        errors = 0
-        batch_size = options["batch_size"]
+        state = self.resume_state or {}
+        self.errors = state.get("errors", 0)
+        self.rows_read = state.get("row", 0)
+        self.changes = ChangeSet() if options["incremental"] else None
+        self.metrics = ImportMetrics(progress_interval=options["progress_interval"])
+        self.worker_peak_rss = None
         dry_run = options["dry_run"]
+        loader = None if dry_run else self._resolve_native_loader(options)
+        if loader is None:
+            options = {**options, "engine": "orm"}
 
-        with csv_path.open(newline="", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh)
-
-            # Process in batches without nested transactions
-            batch_records = []
-
-            for idx, row in enumerate(reader, start=1):
-                try:
-                    sbd = row.pop("sbd", "").strip()
-                    if not sbd:
-                        self.stdout.write(self.style.ERROR(f"Row {idx}: Missing sbd, skipping"))
-                        errors += 1
-                        continue
-
-                    # Clean and validate data
-                    cleaned_data = self._clean_row_data(row)
-
-                    if dry_run:
-                        self.stdout.write(f"Row {idx}: Would process sbd={sbd}")
-                        created += 1
-                    else:
-                        batch_records.append((sbd, cleaned_data))
-
-                        # Process batch when it reaches batch_size
-                        if len(batch_records) >= batch_size:
-                            batch_created, batch_updated, batch_errors = self._process_batch(
-                                batch_records, options
-                            )
-                            created += batch_created
-                            updated += batch_updated
-                            errors += batch_errors
-                            batch_records = []
-
-                        if idx % 100 == 0:  # More frequent updates for debugging
-                            self.stdout.write(f"Processed {idx} records... (Created: {created}, Updated: {updated})")
+        # Single-process ORM batches update the score histogram as they commit;
+        # native loads and shards rebuild it once at the end instead.
+        self.histogram = ScoreHistogramRepository()
+        self.maintain_histogram = loader is None and options["workers"] <= 1
 
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"Row {idx}: Error processing row: {e}"))
-                    errors += 1
-                    continue
+        if options["workers"] > 1:
+            created, updated = self._process_sharded(csv_path, options)
+        else:
+            with open_source(csv_path) as fh:
+                lines = TrackingLineReader(fh)
+                fieldnames = self._read_fieldnames(lines)
+                if state:
+                    lines.seek(state["offset"])
+                chunks = ColumnarCsvReader(
+                    lines, fieldnames, chunk_rows=options["batch_size"], first_row=self.rows_read + 1
+                )
 
-            # Process remaining records in the last batch
-            if batch_records and not dry_run:
-                batch_created, batch_updated, batch_errors = self._process_batch(
-                    batch_records, options
+                def save_checkpoint(batch_created, batch_updated, chunk):
+                    self.checkpoint.save(
+                        offset=chunk.end_offset,
+                        row=self.rows_read,
+                        created=state.get("created", 0) + batch_created,
+                        updated=state.get("updated", 0) + batch_updated,
+                        errors=self.errors,
+                    )
+
+                created, updated = self._write_records(
+                    self._iter_batches(chunks, dry_run),
+                    loader,
+                    options,
+                    on_batch=save_checkpoint if self.checkpoint else None,
                 )
-                created += batch_created
-                updated += batch_updated
-                errors += batch_errors
+                created += state.get("created", 0)
+                updated += state.get("updated", 0)
+                # Written by the interrupted run, whose snapshot was never built
+                self.rows_written += state.get("created", 0) + state.get("updated", 0)
+
+        if options["delete_missing"] and not dry_run:
+            self._delete_missing(csv_path)
+
+        if not dry_run and not self.rows_written:
+            self.stdout.write("No rows changed; the dataset version and snapshot are left as they are")
+        elif not dry_run:
+            if not self.maintain_histogram:
+                with self.metrics.phase("histogram"):
+                    self.histogram.rebuild()
+            # Before the snapshot, which records the version it was read at
+            DatasetVersionRepository().bump()
+            self.version_bumped = True
+            self._publish_snapshot(options)
+
+        if self.checkpoint is not None:
+            # The run completed; there is nothing left to resume
+            self.checkpoint.clear()
+
+        errors = self.errors
+        metrics = self.metrics
 
         # Final summary
         self.stdout.write("")
@@ -143,48 +291,174 @@ class Command(BaseCommand):
         else:
             self.stdout.write(
                 self.style.SUCCESS(f"Import completed: {created} created, {updated} updated, {errors} errors"))
+        self.stdout.write(
+            f"Engine: {options['engine']} - "
+            f"{metrics.rows} rows in {metrics.elapsed:.2f}s ({metrics.rows_per_second():,.0f} rows/sec)"
+        )
+        self._report_metrics()
+
+        if options["report_json"]:
+            self._write_report(csv_path, options, created, updated)
+
+        if not dry_run:
+            if self.changes is not None:
+                self._report_changes(options)
 
             # Verify data was actually saved
             total_count = StudentScore.objects.count()
             self.stdout.write(f"Total records in database: {total_count}")
 
-    def _clean_row_data(self, row):
-        """Clean and validate row data before saving"""
-        cleaned = {}
-
-        # CSV column to model field mapping
-        field_mapping = {
-            'toan': 'math',
-            'ngu_van': 'literature',
-            'ngoai_ngu': 'foreign_lang',
-            'vat_li': 'physics',
-            'hoa_hoc': 'chemistry',
-            'sinh_hoc': 'biology',
-            'lich_su': 'history',
-            'dia_li': 'geography',
-            'gdcd': 'civic_education',
-            'ma_ngoai_ngu': 'foreign_lang_code'
-        }
+    def _process_sharded(self, csv_path, options):
+        """Import the CSV in ``--workers`` processes and merge their counters."""
+        workers = options["workers"]
+        shards = plan_shards(csv_path, workers)
+        with open_source(csv_path) as fh:
+            fieldnames = self._read_fieldnames(TrackingLineReader(fh))
 
-        for csv_col, model_field in field_mapping.items():
-            if csv_col in row:
-                v = row[csv_col]
-
-                if model_field == "foreign_lang_code":
-                    # Keep as string, empty string if no value
-                    cleaned[model_field] = (v or "").strip()
-                else:
-                    # Numeric fields - convert empty strings to None
-                    if v and str(v).strip():
-                        try:
-                            cleaned[model_field] = float(str(v).strip())
-                        except (ValueError, TypeError):
-                            # If conversion fails, store as None
-                            cleaned[model_field] = None
-                    else:
-                        cleaned[model_field] = None
-
-        return cleaned
+        self.stdout.write(f"Importing {len(shards)} shards with {workers} workers …")
+        shard_options = {key: options[key] for key in ("batch_size", "dry_run", "engine", "incremental")}
+
+        # Children must open their own connections instead of sharing ours
+        connections.close_all()
+
+        created = 0
+        updated = 0
+        failed = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            futures = {
+                pool.submit(_import_shard, str(csv_path), start, end, fieldnames, shard_options): number
+                for number, (start, end) in enumerate(shards, start=1)
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.append(futures[future])
+                    # Its committed batches are unknown here, so count it as a write to get the version bumped
+                    self.rows_written += 1
+                    self.stdout.write(self.style.ERROR(f"Shard {futures[future]}/{len(shards)} failed: {e}"))
+                    continue
+                created += result["created"]
+                updated += result["updated"]
+                self.rows_written += result["created"] + result["updated"]
+                self.errors += result["errors"]
+                self.rows_read += result["rows"]
+                if self.changes is not None:
+                    self.changes.merge(result["changes"])
+                self.metrics.merge(result["metrics"])
+                self.metrics.record_rows(self.metrics.rows + result["rows"])
+                self.stdout.write(
+                    f"Shard {futures[future]}/{len(shards)} done: {result['rows']} rows "
+                    f"(Created: {result['created']}, Updated: {result['updated']}, Errors: {result['errors']})"
+                )
+
+        self.worker_peak_rss = peak_rss_bytes(children=True)
+        if failed:
+            raise CommandError(
+                f"{len(failed)} of {len(shards)} shards failed ({', '.join(map(str, sorted(failed)))}); "
+                f"the batches they committed before failing are kept, re-run the import to complete it"
+            )
+        return created, updated
+
+    def _write_records(self, batches, loader, options, on_batch=None):
+        """Persist ``(records, chunk)`` batches and return ``(created, updated)``.
+
+        *on_batch* is called with the running ``(created, updated)`` totals and
+        the source chunk after every committed ORM batch.
+        """
+        created = 0
+        updated = 0
+
+        if options["dry_run"]:
+            for records, _ in batches:
+                created += len(records)
+            return created, updated
+
+        if loader is not None:
+            # Native path: stream every record into one staging table load
+            records = (record for batch_records, _ in batches for record in batch_records)
+            created, updated = loader.load(records, changes=self.changes, metrics=self.metrics)
+            self.rows_written += created + updated
+            return created, updated
+
+        process_batch = self._process_batch_incremental if self.changes is not None else self._process_batch
+
+        # One transaction per parsed chunk
+        for batch_records, chunk in batches:
+            if batch_records:
+                batch_started = time.perf_counter()
+                batch_created, batch_updated, batch_errors = process_batch(
+                    batch_records, options
+                )
+                self.metrics.record_batch(time.perf_counter() - batch_started)
+                created += batch_created
+                updated += batch_updated
+                self.rows_written += batch_created + batch_updated
+                self.errors += batch_errors
+
+            if on_batch:
+                on_batch(created, updated, chunk)
+
+        return created, updated
+
+    def _resolve_native_loader(self, options):
+        """Return the native bulk loader for ``--engine=native`` or *None* for the ORM path."""
+        if options["engine"] != "native":
+            return None
+
+        loader = get_native_loader(connection)
+        if loader is None:
+            self.stdout.write(self.style.WARNING(
+                f"Native engine is not available for '{connection.vendor}', falling back to ORM"
+            ))
+        return loader
+
+    def _read_fieldnames(self, lines):
+        fieldnames = lines.read_header()
+        self.stdout.write(f"CSV headers: {fieldnames}")
+        if 'sbd' not in fieldnames:
+            raise CommandError("CSV must contain 'sbd' column")
+        return fieldnames
+
+    def _iter_batches(self, chunks, dry_run):
+        """Yield ``(records, chunk)`` per parsed chunk, counting rows without an SBD.
+
+        A chunk counts as processed once the consumer asks for the next one,
+        which is also when the throttled progress line is printed.
+        """
+        metrics = self.metrics
+        chunks = iter(chunks)
+        while True:
+            with metrics.phase("read_parse"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+
+            records = []
+            with metrics.phase("clean"):
+                for idx, sbd, cleaned_data in chunk.records():
+                    if not sbd:
+                        self.stdout.write(self.style.ERROR(f"Row {idx}: Missing sbd, skipping"))
+                        self.errors += 1
+                        continue
+
+                    cleaned_data["fingerprint"] = compute_fingerprint(cleaned_data)
+
+                    if dry_run and self.verbosity > 1:
+                        self.stdout.write(f"Row {idx}: Would process sbd={sbd}")
+
+                    records.append((sbd, cleaned_data))
+
+            self.rows_read = chunk.last_row
+            yield records, chunk
+
+            metrics.record_rows(metrics.rows + len(chunk))
+            if metrics.should_report():
+                self.stdout.write(
+                    f"Processed {self.rows_read:,} records... "
+                    f"({metrics.rows_per_second():,.0f} rows/sec, "
+                    f"last {metrics.rolling_window:.0f}s: {metrics.rolling_rows_per_second():,.0f} rows/sec)"
+                )
 
     def _process_batch(self, batch_records, options):
         """Process a batch of records using bulk operations for speed"""
@@ -194,20 +468,24 @@ class Command(BaseCommand):
 
         try:
             with transaction.atomic():
-                # Extract SBDs for this batch
-                batch_sbds = [sbd for sbd, _ in batch_records]
+                # Later duplicates of an SBD win, as in the CSV order and on every other path
+                batch = dict(batch_records)
+                batch_sbds = list(batch)
 
                 # Get existing records in one query (using r_number as primary key)
-                existing_records = {
-                    record.r_number: record
-                    for record in StudentScore.objects.filter(r_number__in=batch_sbds)
-                }
+                with self.metrics.phase("lookup"):
+                    existing_records = {
+                        record.r_number: record
+                        for record in StudentScore.objects.filter(r_number__in=batch_sbds)
+                    }
+                old_scores = {sbd: score_values(record) for sbd, record in existing_records.items()}
+                histogram_changes = {}
 
                 # Separate records into create and update lists
                 records_to_create = []
                 records_to_update = []
 
-                for sbd, cleaned_data in batch_records:
+                for sbd, cleaned_data in batch.items():
                     try:
                         if sbd in existing_records:
                             # Update existing record
@@ -228,37 +506,262 @@ class Command(BaseCommand):
                 # Bulk create new records
                 if records_to_create:
                     try:
-                        StudentScore.objects.bulk_create(
-                            records_to_create,
-                            batch_size=1000,
-                            ignore_conflicts=True  # Skip duplicates instead of failing
-                        )
+                        with self.metrics.phase("bulk_create"):
+                            StudentScore.objects.bulk_create(
+                                records_to_create,
+                                batch_size=1000,
+                                ignore_conflicts=True  # Skip SBDs inserted meanwhile by another shard
+                            )
                         created += len(records_to_create)
+                        for record in records_to_create:
+                            histogram_changes[record.r_number] = (None, score_values(record))
                     except Exception as e:
+                        self._raise_in_shard(e)
                         self.stdout.write(self.style.ERROR(f"Bulk create failed: {e}"))
                         errors += len(records_to_create)
 
                 # Bulk update existing records
                 if records_to_update:
                     try:
-                        # Get all field names except 'r_number' for bulk_update
-                        update_fields = [
-                            field.name for field in StudentScore._meta.fields
-                            if field.name != 'r_number'
-                        ]
-
-                        StudentScore.objects.bulk_update(
-                            records_to_update,
-                            update_fields,
-                            batch_size=1000
-                        )
+                        # Content and fingerprint; the combination totals are generated
+                        update_fields = [*CONTENT_FIELDS, "fingerprint"]
+
+                        with self.metrics.phase("bulk_update"):
+                            StudentScore.objects.bulk_update(
+                                records_to_update,
+                                update_fields,
+                                batch_size=1000
+                            )
                         updated += len(records_to_update)
+                        for record in records_to_update:
+                            histogram_changes[record.r_number] = (old_scores[record.r_number], score_values(record))
                     except Exception as e:
+                        self._raise_in_shard(e)
                         self.stdout.write(self.style.ERROR(f"Bulk update failed: {e}"))
                         errors += len(records_to_update)
 
+                self._record_histogram(histogram_changes.values())
+
+                commit_started = time.perf_counter()
+            self.metrics.add_phase("commit", time.perf_counter() - commit_started)
+
         except Exception as e:
+
+            self._raise_in_shard(e)
             self.stdout.write(self.style.ERROR(f"Batch transaction failed: {e}"))
             errors += len(batch_records)
 
-        return created, updated, errors
\ No newline at end of file
+        return created, updated, errors
+
+    def _process_batch_incremental(self, batch_records, options):
+        """Write only the new or changed records of a batch, tracking them in ``self.changes``."""
+        created = 0
+        updated = 0
+        errors = 0
+        changes = ChangeSet()
+
+        try:
+            with transaction.atomic():
+                # Later duplicates of an SBD win, as in the CSV order
+                batch = dict(batch_records)
+
+                # Compare fingerprints only; full rows are fetched for changed SBDs
+                with self.metrics.phase("lookup"):
+                    stored = dict(
+                        StudentScore.objects.filter(r_number__in=list(batch)).values_list("r_number", "fingerprint")
+                    )
+                new_sbds = [sbd for sbd in batch if sbd not in stored]
+                changed_sbds = [
+                    sbd for sbd in batch if sbd in stored and stored[sbd] != batch[sbd]["fingerprint"]
+                ]
+                changes.unchanged = len(batch) - len(new_sbds) - len(changed_sbds)
+                histogram_changes = []
+
+                if new_sbds:
+                    try:
+                        with self.metrics.phase("bulk_create"):
+                            StudentScore.objects.bulk_create(
+                                [StudentScore(r_number=sbd, **batch[sbd]) for sbd in new_sbds],
+                                batch_size=1000,
+                                ignore_conflicts=True
+                            )
+                        created += len(new_sbds)
+                        for sbd in new_sbds:
+                            changes.inserted.add(sbd)
+                            changes.touch(None, batch[sbd])
+                            histogram_changes.append((None, batch[sbd]))
+                    except Exception as e:
+                        self._raise_in_shard(e)
+                        self.stdout.write(self.style.ERROR(f"Bulk create failed: {e}"))
+                        errors += len(new_sbds)
+
+                if changed_sbds:
+                    try:
+                        with self.metrics.phase("lookup"):
+                            old_rows = {
+                                row["r_number"]: row
+                                for row in StudentScore.objects.filter(r_number__in=changed_sbds)
+                                .values("r_number", *CONTENT_FIELDS)
+                            }
+                        update_fields = [*CONTENT_FIELDS, "fingerprint"]
+                        with self.metrics.phase("bulk_update"):
+                            StudentScore.objects.bulk_update(
+                                [StudentScore(r_number=sbd, **batch[sbd]) for sbd in changed_sbds],
+                                update_fields,
+                                batch_size=1000
+                            )
+                        updated += len(changed_sbds)
+                        for sbd in changed_sbds:
+                            changes.updated.add(sbd)
+                            changes.touch(old_rows.get(sbd), batch[sbd])
+                            histogram_changes.append((old_rows.get(sbd), batch[sbd]))
+                    except Exception as e:
+                        self._raise_in_shard(e)
+                        self.stdout.write(self.style.ERROR(f"Bulk update failed: {e}"))
+                        errors += len(changed_sbds)
+
+                self._record_histogram(histogram_changes)
+
+                commit_started = time.perf_counter()
+            self.metrics.add_phase("commit", time.perf_counter() - commit_started)
+
+        except Exception as e:
+
+            self._raise_in_shard(e)
+            self.stdout.write(self.style.ERROR(f"Batch transaction failed: {e}"))
+            return 0, 0, len(batch_records)
+
+        self.changes.merge(changes)
+        return created, updated, errors
+
+    def _publish_snapshot(self, options):
+        """Swap in a fresh columnar snapshot, or retire the stale one with ``--skip-snapshot``."""
+        if options["skip_snapshot"]:
+            invalidate_snapshot()
+            return
+        with self.metrics.phase("snapshot"):
+            snapshot = build_snapshot()
+        self.stdout.write(f"Snapshot v{snapshot.version} published ({snapshot.rows} rows)")
+
+    def _raise_in_shard(self, error):
+        """Re-raise a database error in a ``--workers`` process instead of counting row errors."""
+        if self.in_shard and isinstance(error, DatabaseError):
+            raise error
+
+    def _record_histogram(self, changes):
+        """Apply ``(old, new)`` row changes to the score histogram when this run maintains it."""
+        if self.maintain_histogram:
+            with self.metrics.phase("histogram"):
+                self.histogram.record_changes(changes)
+
+    def _delete_missing(self, csv_path):
+        """Delete rows whose SBD no longer appears in the CSV (``--delete-missing``)."""
+        with open_source(csv_path) as fh:
+            lines = TrackingLineReader(fh)
+            sbd_index = lines.read_header().index("sbd")
+            seen = {row[sbd_index].strip() for row in csv.reader(lines) if len(row) > sbd_index}
+
+        missing = [
+            sbd for sbd in StudentScore.objects.values_list("r_number", flat=True).iterator(chunk_size=10000)
+            if sbd not in seen
+        ]
+
+        for start in range(0, len(missing), 1000):
+            chunk = missing[start:start + 1000]
+            with transaction.atomic():
+                rows = list(StudentScore.objects.filter(r_number__in=chunk).values("r_number", *CONTENT_FIELDS))
+                for row in rows:
+                    self.changes.deleted.add(row["r_number"])
+                    self.changes.touch(row, None)
+                self.rows_written += StudentScore.objects.filter(r_number__in=chunk).delete()[0]
+                self._record_histogram((row, None) for row in rows)
+
+        self.stdout.write(f"Deleted {len(missing)} records missing from the CSV")
+
+    def _report_metrics(self):
+        """Print the phase breakdown, batch latency percentiles and peak memory."""
+        report = self.metrics.as_dict()
+        phases = ", ".join(
+            f"{name} {seconds:.2f}s" for name, seconds in report["phases"].items() if seconds
+        )
+        self.stdout.write(f"Phases: {phases or '-'}")
+
+        latency = report["batches"]["latency_ms"]
+        if latency:
+            self.stdout.write(
+                f"Batch latency ({report['batches']['count']} batches): p50 {latency['p50']:.0f}ms, "
+                f"p90 {latency['p90']:.0f}ms, p99 {latency['p99']:.0f}ms, max {latency['max']:.0f}ms"
+            )
+
+        if report["peak_rss_bytes"] is not None:
+            line = f"Peak RSS: {report['peak_rss_bytes'] / 2**20:,.1f} MiB"
+            if self.worker_peak_rss:
+                line += f" (workers: {self.worker_peak_rss / 2**20:,.1f} MiB)"
+            self.stdout.write(line)
+
+    def _write_report(self, csv_path, options, created, updated):
+        """Write the ``--report-json`` run report."""
+        report = {
+            "source": str(csv_path),
+            "engine": options["engine"],
+            "workers": options["workers"],
+            "batch_size": options["batch_size"],
+            "dry_run": options["dry_run"],
+            "incremental": options["incremental"],
+            "resumed_from_row": (self.resume_state or {}).get("row"),
+            "created": created,
+            "updated": updated,
+            "errors": self.errors,
+            **self.metrics.as_dict(),
+            "worker_peak_rss_bytes": self.worker_peak_rss,
+        }
+        with open(options["report_json"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(f"Run report written to {options['report_json']}")
+
+    def _report_changes(self, options):
+        changes = self.changes
+        self.stdout.write(
+            f"Incremental: {len(changes.inserted)} inserted, {len(changes.updated)} changed, "
+            f"{len(changes.deleted)} deleted, {changes.unchanged} unchanged"
+        )
+        self.stdout.write(f"Touched subjects: {', '.join(changes.as_dict()['subjects']) or '-'}")
+
+        if options["changes_out"]:
+            with open(options["changes_out"], "w", encoding="utf-8") as fh:
+                json.dump(changes.as_dict(), fh)
+            self.stdout.write(f"Change set written to {options['changes_out']}")
+
+
+def _import_shard(csv_path, start, end, fieldnames, options):
+    """Process-pool entry point: import the rows of one ``[start, end)`` byte range."""
+    command = Command()
+    command.verbosity = 1
+    command.errors = 0
+    command.rows_read = 0
+    command.rows_written = 0
+    command.in_shard = True
+    command.changes = ChangeSet() if options["incremental"] else None
+    command.metrics = ImportMetrics(progress_interval=None)
+    command.maintain_histogram = False
+    loader = get_native_loader(connection) if options["engine"] == "native" else None
+
+    try:
+        with open(csv_path, "rb") as fh:
+            chunks = ColumnarCsvReader(
+                iter_shard_lines(fh, start, end), fieldnames, chunk_rows=options["batch_size"]
+            )
+            created, updated = command._write_records(
+                command._iter_batches(chunks, options["dry_run"]), loader, options
+            )
+    finally:
+        connection.close()
+
+    return {
+        "created": created,
+        "updated": updated,
+        "errors": command.errors,
+        "rows": command.rows_read,
+        "changes": command.changes,
+        "metrics": command.metrics.as_dict(include_latencies=True),
+    }
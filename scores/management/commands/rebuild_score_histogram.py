@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ...models import ScoreHistogram
+from ...repositories import DatasetVersionRepository, ScoreHistogramRepository
+
+
+class Command(BaseCommand):
+    help = "Recompute the score histogram used by reports and the dashboard from StudentScore"
+
+    def handle(self, *args, **options):
+        ScoreHistogramRepository().rebuild()
+        # Cached reports were derived from the old histogram
+        DatasetVersionRepository().bump()
+        buckets = ScoreHistogram.objects.exclude(subject=ScoreHistogram.ROWS_SUBJECT).count()
+        self.stdout.write(self.style.SUCCESS(f"Score histogram rebuilt: {buckets} buckets"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentscore',
+            name='fingerprint',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
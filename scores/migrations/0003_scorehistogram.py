@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:38
+
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Round
+
+SUBJECT_FIELDS = (
+    'math', 'literature', 'foreign_lang', 'physics', 'chemistry',
+    'biology', 'history', 'geography', 'civic_education',
+)
+
+
+def build_histogram(apps, schema_editor):
+    StudentScore = apps.get_model('scores', 'StudentScore')
+    ScoreHistogram = apps.get_model('scores', 'ScoreHistogram')
+
+    rows = [ScoreHistogram(subject='__rows__', bucket=0, count=StudentScore.objects.count())]
+    for subject in SUBJECT_FIELDS:
+        grouped = (
+            StudentScore.objects.filter(**{f"{subject}__isnull": False})
+            .values(bucket=Round(F(subject) * 100))
+            .annotate(count=Count('r_number'), score_sum=Sum(subject))
+            .order_by()
+        )
+        rows.extend(
+            ScoreHistogram(subject=subject, bucket=int(row['bucket']), count=row['count'], score_sum=row['score_sum'])
+            for row in grouped
+        )
+    ScoreHistogram.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scores', '0002_studentscore_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=20)),
+                ('bucket', models.IntegerField()),
+                ('count', models.BigIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('subject', 'bucket'), name='unique_score_histogram_bucket')],
+            },
+        ),
+        migrations.RunPython(build_histogram, migrations.RunPython.noop),
+    ]
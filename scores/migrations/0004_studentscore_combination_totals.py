@@ -0,0 +1,168 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:51
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.math
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scores', '0003_scorehistogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentscore',
+            name='a00_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.F('chemistry')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a00_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a00_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.F('chemistry')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a01_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.F('foreign_lang')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a01_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a01_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.F('foreign_lang')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a02_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.F('biology')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a02_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='a02_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.F('biology')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='b00_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.F('chemistry')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.F('biology')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='b00_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='b00_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.F('chemistry')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('biology__isnull', False)), then=models.F('biology')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='c00_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.F('literature')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('history__isnull', False)), then=models.F('history')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('geography__isnull', False)), then=models.F('geography')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('history__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('geography__isnull', False)), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='c00_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('history__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('geography__isnull', False)), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='c00_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.F('literature')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('history__isnull', False)), then=models.F('history')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('geography__isnull', False)), then=models.F('geography')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='c01_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.F('literature')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='c01_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='c01_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.F('literature')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('physics__isnull', False)), then=models.F('physics')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='d01_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.F('literature')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.F('foreign_lang')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='d01_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='d01_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('literature__isnull', False)), then=models.F('literature')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.F('foreign_lang')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='d07_average',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.F('chemistry')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.F('foreign_lang')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.Value(1)), default=models.Value(0))), models.Value(0))), output_field=models.FloatField(null=True)),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='d07_count',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.Value(1)), default=models.Value(0))), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='studentscore',
+            name='d07_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('math__isnull', False)), then=models.F('math')), default=models.Value(0.0)), '+', models.Case(models.When(models.Q(('chemistry__isnull', False)), then=models.F('chemistry')), default=models.Value(0.0))), '+', models.Case(models.When(models.Q(('foreign_lang__isnull', False), ('foreign_lang_code', 'N1')), then=models.F('foreign_lang')), default=models.Value(0.0))), models.DecimalField(decimal_places=3, max_digits=12)), 2), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-a00_total', '-a00_average', '-a00_count', 'r_number'], name='score_a00_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-a01_total', '-a01_average', '-a01_count', 'r_number'], name='score_a01_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-a02_total', '-a02_average', '-a02_count', 'r_number'], name='score_a02_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-b00_total', '-b00_average', '-b00_count', 'r_number'], name='score_b00_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-c00_total', '-c00_average', '-c00_count', 'r_number'], name='score_c00_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-c01_total', '-c01_average', '-c01_count', 'r_number'], name='score_c01_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-d01_total', '-d01_average', '-d01_count', 'r_number'], name='score_d01_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentscore',
+            index=models.Index(fields=['-d07_total', '-d07_average', '-d07_count', 'r_number'], name='score_d07_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:59
+
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    DatasetVersion = apps.get_model('scores', 'DatasetVersion')
+    DatasetVersion.objects.get_or_create(id=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scores', '0004_studentscore_combination_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
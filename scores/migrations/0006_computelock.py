@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scores', '0005_datasetversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComputeLock',
+            fields=[
+                ('key', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=32)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1,3 +1,20 @@
-from .student_score import StudentScore
+from .combinations import COMBINATION_FIELDS, COMBINATIONS, Combination, get_combination
+from .compute_lock import ComputeLock
+from .dataset_version import DatasetVersion
+from .score_histogram import ScoreHistogram, score_bucket
+from .student_score import CONTENT_FIELDS, SUBJECT_FIELDS, StudentScore, compute_fingerprint
 
-__all__ = ['StudentScore']
\ No newline at end of file
+__all__ = [
+    'COMBINATIONS',
+    'COMBINATION_FIELDS',
+    'CONTENT_FIELDS',
+    'Combination',
+    'ComputeLock',
+    'DatasetVersion',
+    'SUBJECT_FIELDS',
+    'ScoreHistogram',
+    'StudentScore',
+    'compute_fingerprint',
+    'get_combination',
+    'score_bucket',
+]
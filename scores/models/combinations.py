@@ -0,0 +1,116 @@
+import operator
+from dataclasses import dataclass
+from functools import reduce
+from typing import Dict, Optional, Tuple
+
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Cast, NullIf, Round
+
+
+@dataclass(frozen=True)
+class Combination:
+    """An admission subject combination (*khối*) such as A00 or D01.
+
+    When ``foreign_lang_code`` is set, the ``foreign_lang`` score only counts
+    for students who sat that language (``N1`` = English).
+    """
+
+    code: str
+    subjects: Tuple[str, str, str]
+    foreign_lang_code: Optional[str] = None
+
+    def counts_subject(self, subject: str, foreign_lang_code: Optional[str]) -> bool:
+        """Return *True* if a student's *subject* score belongs to this combination."""
+        if subject != 'foreign_lang' or self.foreign_lang_code is None:
+            return True
+        return (foreign_lang_code or '') == self.foreign_lang_code
+
+    def counted_condition(self, subject: str) -> Q:
+        """SQL counterpart of :meth:`counts_subject` for a row that has a *subject* score."""
+        condition = Q(**{f'{subject}__isnull': False})
+        if subject == 'foreign_lang' and self.foreign_lang_code is not None:
+            condition &= Q(foreign_lang_code=self.foreign_lang_code)
+        return condition
+
+    # ------------------------------------------------------------------
+    # Stored columns on ``StudentScore``
+    # ------------------------------------------------------------------
+    @property
+    def total_field(self) -> str:
+        return f'{self.code.lower()}_total'
+
+    @property
+    def average_field(self) -> str:
+        return f'{self.code.lower()}_average'
+
+    @property
+    def count_field(self) -> str:
+        return f'{self.code.lower()}_count'
+
+    @property
+    def index_name(self) -> str:
+        return f'score_{self.code.lower()}_rank_idx'
+
+    def generated_fields(self) -> Dict[str, models.GeneratedField]:
+        """Stored total, average and subject count columns, maintained by the database."""
+        count = reduce(operator.add, (
+            Case(When(self.counted_condition(subject), then=Value(1)), default=Value(0))
+            for subject in self.subjects
+        ))
+        # Rounded to hundredths so that equal totals compare equal despite float
+        # sums.  Rounded as a decimal: PostgreSQL has no round(double precision, int);
+        # wide enough that no total of stored scores overflows it.
+        total = Cast(Round(Cast(reduce(operator.add, (
+            Case(When(self.counted_condition(subject), then=F(subject)), default=Value(0.0))
+            for subject in self.subjects
+        )), models.DecimalField(max_digits=12, decimal_places=3)), 2), models.FloatField())
+        return {
+            self.total_field: models.GeneratedField(
+                expression=total, output_field=models.FloatField(), db_persist=True,
+            ),
+            # NULL for students without any subject of the combination
+            self.average_field: models.GeneratedField(
+                expression=total / NullIf(count, Value(0)), output_field=models.FloatField(null=True),
+                db_persist=True,
+            ),
+            self.count_field: models.GeneratedField(
+                expression=count, output_field=models.SmallIntegerField(), db_persist=True,
+            ),
+        }
+
+    def rank_index(self) -> models.Index:
+        """Descending index matching the ranking order, so top-N is an index range read."""
+        return models.Index(
+            fields=[f'-{self.total_field}', f'-{self.average_field}', f'-{self.count_field}', 'r_number'],
+            name=self.index_name,
+        )
+
+
+COMBINATIONS = {
+    combination.code: combination for combination in (
+        Combination('A00', ('math', 'physics', 'chemistry')),
+        Combination('A01', ('math', 'physics', 'foreign_lang'), foreign_lang_code='N1'),
+        Combination('A02', ('math', 'physics', 'biology')),
+        Combination('B00', ('math', 'chemistry', 'biology')),
+        Combination('C00', ('literature', 'history', 'geography')),
+        Combination('C01', ('literature', 'math', 'physics')),
+        Combination('D01', ('literature', 'math', 'foreign_lang'), foreign_lang_code='N1'),
+        Combination('D07', ('math', 'chemistry', 'foreign_lang'), foreign_lang_code='N1'),
+    )
+}
+
+# Stored columns added to ``StudentScore`` for every combination
+COMBINATION_FIELDS = tuple(
+    name for combination in COMBINATIONS.values()
+    for name in (combination.total_field, combination.average_field, combination.count_field)
+)
+
+# Former name of A00 in the API
+COMBINATION_ALIASES = {'GROUP-A': 'A00'}
+
+
+def get_combination(code: str) -> Optional[Combination]:
+    """Look up a combination by code (case-insensitive, aliases allowed)."""
+    code = code.upper()
+    return COMBINATIONS.get(COMBINATION_ALIASES.get(code, code))
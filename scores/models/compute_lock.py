@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class ComputeLock(models.Model):
+    """Lease held by the one process computing a cached result.
+
+    Taken with an ``INSERT`` (or a conditional ``UPDATE`` of an expired
+    lease), so exactly one caller wins whatever the cache backend.
+    """
+
+    key = models.CharField(primary_key=True, max_length=200)
+    token = models.CharField(max_length=32)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.key
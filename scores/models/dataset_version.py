@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class DatasetVersion(models.Model):
+    """Single-row counter bumped by every write to ``StudentScore``.
+
+    Cached analytics are keyed by the current version, so one increment
+    invalidates every cached result in every process.
+    """
+
+    SINGLETON_ID = 1
+
+    version = models.BigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"v{self.version}"
@@ -0,0 +1,35 @@
+from django.db import models
+
+
+def score_bucket(score: float) -> int:
+    """Return the histogram bucket of *score*: the score in hundredths of a point.
+
+    Exam scores come in 0.2 / 0.25 steps, so hundredths hold them exactly and
+    the level boundaries (4, 6, 8) fall on bucket edges.
+    """
+    return round(score * 100)
+
+
+class ScoreHistogram(models.Model):
+    """Number of ``StudentScore`` rows per subject and score bucket.
+
+    Kept up to date by every write path so that reports and the dashboard read
+    a few hundred rows instead of scanning all students.  The row with
+    ``subject == ROWS_SUBJECT`` counts the ``StudentScore`` rows themselves.
+    """
+
+    ROWS_SUBJECT = '__rows__'
+
+    subject = models.CharField(max_length=20)
+    bucket = models.IntegerField()
+    count = models.BigIntegerField(default=0)
+    # Sum of the exact scores in the bucket, for averages
+    score_sum = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['subject', 'bucket'], name='unique_score_histogram_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject}[{self.bucket / 100:.2f}] = {self.count}"
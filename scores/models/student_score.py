@@ -1,5 +1,31 @@
+import hashlib
+
 from django.db import models
 
+from .combinations import COMBINATIONS
+
+# Columns that make up a row's *content*; the fingerprint is derived from them.
+CONTENT_FIELDS = (
+    'math', 'literature', 'foreign_lang', 'physics', 'chemistry',
+    'biology', 'history', 'geography', 'civic_education', 'foreign_lang_code',
+)
+# The numeric score columns
+SUBJECT_FIELDS = tuple(name for name in CONTENT_FIELDS if name != 'foreign_lang_code')
+
+
+def compute_fingerprint(values) -> int:
+    """Return a signed 64-bit digest of the content fields in the mapping *values*."""
+    parts = []
+    for field in CONTENT_FIELDS:
+        value = values.get(field)
+        if field == 'foreign_lang_code':
+            parts.append(value or '')
+        else:
+            parts.append('' if value is None else repr(float(value)))
+    digest = hashlib.blake2b('|'.join(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
 class StudentScore(models.Model):
     r_number = models.CharField(primary_key=True, max_length=20)
     math = models.FloatField(null=True, blank=True)
@@ -12,8 +38,25 @@ class StudentScore(models.Model):
     geography = models.FloatField(null=True, blank=True)
     civic_education = models.FloatField(null=True, blank=True)
     foreign_lang_code = models.CharField(max_length=15, blank=True)
+    # Content digest used by ``import_scores --incremental`` to skip unchanged rows
+    fingerprint = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [combination.rank_index() for combination in COMBINATIONS.values()]
 
     def __str__(self):
         return self.r_number
 
+    def save(self, *args, **kwargs):
+        self.fingerprint = compute_fingerprint(self.__dict__)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'fingerprint'}
+        super().save(*args, **kwargs)
+
+
 
+# Stored ``<code>_total``, ``<code>_average`` and ``<code>_count`` columns per combination
+for _combination in COMBINATIONS.values():
+    for _name, _field in _combination.generated_fields().items():
+        StudentScore.add_to_class(_name, _field)
@@ -1,3 +1,6 @@
+from .compute_lock_repository import ComputeLockRepository
+from .dataset_version_repository import DatasetVersionRepository
+from .score_histogram_repository import ScoreHistogramRepository
 from .student_score_repository import StudentScoreRepository
 
-__all__ = ['StudentScoreRepository']
\ No newline at end of file
+__all__ = ['ComputeLockRepository', 'DatasetVersionRepository', 'ScoreHistogramRepository', 'StudentScoreRepository']
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from scores.models import ComputeLock
+
+
+class ComputeLockRepository:
+    """Cross-process leases on cache keys, stored in the database every worker shares."""
+
+    def __init__(self):
+        self.model = ComputeLock
+
+    def acquire(self, key: str, ttl: float) -> Optional[str]:
+        """Take the lease on *key* for *ttl* seconds; return its token, or *None* if it is held."""
+        token = uuid.uuid4().hex
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=ttl)
+        # An expired lease is taken over by a conditional UPDATE that only one caller can match
+        if self.model.objects.filter(key=key, expires_at__lte=now).update(token=token, expires_at=expires_at):
+            return token
+        try:
+            with transaction.atomic():
+                self.model.objects.create(key=key, token=token, expires_at=expires_at)
+        except IntegrityError:
+            return None
+        return token
+
+    def release(self, key: str, token: str) -> None:
+        # Leave the lease alone if it expired and another caller took it
+        self.model.objects.filter(key=key, token=token).delete()
+
+    def held(self, key: str) -> bool:
+        return self.model.objects.filter(key=key, expires_at__gt=timezone.now()).exists()
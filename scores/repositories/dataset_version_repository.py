@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from scores.models import DatasetVersion
+
+from . import request_memo
+
+
+class DatasetVersionRepository:
+    """Read and bump the global dataset version.
+
+    The version is read at most once per request; a bump is a single atomic
+    ``UPDATE ... SET version = version + 1`` and becomes visible to other
+    processes when the surrounding transaction commits.
+    """
+
+    def __init__(self):
+        self.model = DatasetVersion
+
+    def current(self) -> int:
+        return self._state()[0]
+
+    def last_modified(self) -> Optional[datetime]:
+        """When the version was last bumped; *None* before the first bump is recorded."""
+        return self._state()[1]
+
+    def bump(self) -> None:
+        with transaction.atomic():
+            updated = self.model.objects.filter(pk=DatasetVersion.SINGLETON_ID).update(
+                version=F('version') + 1, updated_at=timezone.now(),
+            )
+            if not updated:
+                self.model.objects.get_or_create(pk=DatasetVersion.SINGLETON_ID, defaults={'version': 2})
+        request_memo.forget()
+
+    def _state(self) -> Tuple[int, Optional[datetime]]:
+        return request_memo.memoize('dataset_version', self._read)
+
+    def _read(self) -> Tuple[int, Optional[datetime]]:
+        row = (
+            self.model.objects.filter(pk=DatasetVersion.SINGLETON_ID)
+            .values_list('version', 'updated_at').first()
+        )
+        return row or (1, None)
@@ -0,0 +1,43 @@
+"""Per-request memo for repository reads.
+
+The memo only exists between ``request_started`` and ``request_finished``, so
+several services answering one request share a result while management
+commands and shells always read fresh data.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable
+
+from asgiref.local import Local
+from django.core.signals import request_finished, request_started
+
+_state = Local()
+
+
+def _start(**kwargs) -> None:
+    _state.memo = {}
+
+
+def _finish(**kwargs) -> None:
+    _state.memo = None
+
+
+def memoize(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Return the memoized value for *key*, calling *compute* on a miss."""
+    memo = getattr(_state, 'memo', None)
+    if memo is None:
+        return compute()
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
+
+
+def forget() -> None:
+    """Drop memoized values after a write inside the current request."""
+    if getattr(_state, 'memo', None):
+        _state.memo = {}
+
+
+def connect_signals() -> None:
+    request_started.connect(_start, dispatch_uid='scores.request_memo.start')
+    request_finished.connect(_finish, dispatch_uid='scores.request_memo.finish')
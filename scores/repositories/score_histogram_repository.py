@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Round
+
+from scores.models import SUBJECT_FIELDS, ScoreHistogram, StudentScore, score_bucket
+
+from . import request_memo
+
+# (old values, new values) of one StudentScore row; *None* when it did not / no longer exists
+RowChange = Tuple[Optional[Mapping], Optional[Mapping]]
+
+# Lower bucket bound of each score level, highest first
+LEVEL_THRESHOLDS = (
+    ('excellent', 800),
+    ('good', 600),
+    ('average', 400),
+    ('below_average', None),
+)
+
+
+def score_values(instance: StudentScore) -> Dict[str, Optional[float]]:
+    """Return the subject scores of *instance* as a plain mapping."""
+    return {subject: getattr(instance, subject) for subject in SUBJECT_FIELDS}
+
+
+def score_level(bucket: int) -> str:
+    """Return the score level name of a histogram *bucket*."""
+    for level, lower in LEVEL_THRESHOLDS:
+        if lower is None or bucket >= lower:
+            return level
+
+
+@dataclass
+class SubjectAggregate:
+    """Count, sum, range and level counts of one subject's non-null scores.
+
+    ``min_score`` / ``max_score`` are bucket values, exact to 0.01 points.
+    """
+
+    subject: str
+    count: int = 0
+    score_sum: float = 0.0
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    levels: Dict[str, int] = field(default_factory=lambda: {level: 0 for level, _ in LEVEL_THRESHOLDS})
+
+    @property
+    def average(self) -> Optional[float]:
+        return self.score_sum / self.count if self.count else None
+
+    def add(self, bucket: int, count: int, score_sum: float) -> None:
+        score = bucket / 100
+        self.count += count
+        self.score_sum += score_sum
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.levels[score_level(bucket)] += count
+
+    def level_counts(self) -> Dict[str, int]:
+        """Return the count per score level plus ``total_students``."""
+        return {**self.levels, 'total_students': self.count}
+
+
+class ScoreHistogramRepository:
+    def __init__(self):
+        self.model = ScoreHistogram
+
+    # ---------------------------------------------------------------------
+    # READ operations
+    # ---------------------------------------------------------------------
+    def subject_buckets(self, subjects: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[int, int, float]]]:
+        """Return ``{subject: [(bucket, count, score_sum), ...]}`` ordered by bucket."""
+        qs = self.model.objects.filter(count__gt=0).exclude(subject=ScoreHistogram.ROWS_SUBJECT)
+        if subjects is not None:
+            qs = qs.filter(subject__in=list(subjects))
+
+        buckets: Dict[str, list] = defaultdict(list)
+        for subject, bucket, count, score_sum in qs.order_by('subject', 'bucket').values_list(
+            'subject', 'bucket', 'count', 'score_sum'
+        ):
+            buckets[subject].append((bucket, count, score_sum))
+        return buckets
+
+    def aggregate_subjects(self, subjects: Optional[Iterable[str]] = None) -> Dict[str, SubjectAggregate]:
+        """Return a :class:`SubjectAggregate` per subject (all subjects by default).
+
+        The whole histogram is read in one query and memoized for the current
+        request, so every service answering it shares the same pass.
+        """
+        aggregates, _ = request_memo.memoize('score_histogram', self._aggregate_all)
+        subjects = SUBJECT_FIELDS if subjects is None else subjects
+        return {subject: aggregates.get(subject) or SubjectAggregate(subject) for subject in subjects}
+
+    def level_counts(self, subject: str) -> Dict[str, int]:
+        """Return counts of score levels for *subject*, plus ``total_students``."""
+        return self.aggregate_subjects([subject])[subject].level_counts()
+
+    def row_count(self) -> int:
+        """Return the number of ``StudentScore`` rows."""
+        _, rows = request_memo.memoize('score_histogram', self._aggregate_all)
+        return rows
+
+    def _aggregate_all(self) -> Tuple[Dict[str, SubjectAggregate], int]:
+        aggregates: Dict[str, SubjectAggregate] = {}
+        rows = 0
+        for subject, bucket, count, score_sum in self.model.objects.filter(count__gt=0).values_list(
+            'subject', 'bucket', 'count', 'score_sum'
+        ):
+            if subject == ScoreHistogram.ROWS_SUBJECT:
+                rows = count
+                continue
+            aggregates.setdefault(subject, SubjectAggregate(subject)).add(bucket, count, score_sum)
+        return aggregates, rows
+
+    # ---------------------------------------------------------------------
+    # WRITE operations
+    # ---------------------------------------------------------------------
+    def record_changes(self, changes: Iterable[RowChange]) -> None:
+        """Apply the bucket deltas of ``(old, new)`` row changes.
+
+        Deltas are summed in Python first, so a whole import batch costs one
+        ``INSERT`` for unseen buckets plus one ``UPDATE`` per touched subject.
+        Call it inside the transaction that writes the rows.
+        """
+        deltas: Dict[Tuple[str, int], list] = defaultdict(lambda: [0, 0.0])
+        for old, new in changes:
+            for values, sign in ((old, -1), (new, 1)):
+                if values is None:
+                    continue
+                deltas[(ScoreHistogram.ROWS_SUBJECT, 0)][0] += sign
+                for subject in SUBJECT_FIELDS:
+                    score = values.get(subject)
+                    if score is not None:
+                        delta = deltas[(subject, score_bucket(score))]
+                        delta[0] += sign
+                        delta[1] += sign * score
+
+        deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+        if not deltas:
+            return
+        request_memo.forget()
+
+        self.model.objects.bulk_create(
+            [self.model(subject=subject, bucket=bucket) for subject, bucket in sorted(deltas)],
+            ignore_conflicts=True,
+        )
+
+        by_subject: Dict[str, list] = defaultdict(list)
+        for (subject, bucket), (count, score_sum) in sorted(deltas.items()):
+            by_subject[subject].append((bucket, count, score_sum))
+
+        # Plain SQL: compiling hundreds of ``When`` expressions per batch costs
+        # far more than running the statement.
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for subject, rows in by_subject.items():
+                cases = " ".join(["WHEN %s THEN %s"] * len(rows))
+                cursor.execute(
+                    f"UPDATE {qn(self.model._meta.db_table)} SET "
+                    f"{qn('count')} = {qn('count')} + CASE {qn('bucket')} {cases} ELSE 0 END, "
+                    f"{qn('score_sum')} = {qn('score_sum')} + CASE {qn('bucket')} {cases} ELSE 0 END "
+                    f"WHERE {qn('subject')} = %s AND {qn('bucket')} IN ({', '.join(['%s'] * len(rows))})",
+                    [
+                        *(value for bucket, count, _ in rows for value in (bucket, count)),
+                        *(value for bucket, _, score_sum in rows for value in (bucket, score_sum)),
+                        subject,
+                        *(bucket for bucket, _, _ in rows),
+                    ],
+                )
+
+    def reset(self) -> None:
+        """Forget all counts (after the ``StudentScore`` table was emptied)."""
+        request_memo.forget()
+        self.model.objects.all().delete()
+
+    def rebuild(self) -> None:
+        """Recompute the whole histogram from ``StudentScore`` (one grouped scan per subject)."""
+        rows = [self.model(subject=ScoreHistogram.ROWS_SUBJECT, bucket=0, count=StudentScore.objects.count())]
+        for subject in SUBJECT_FIELDS:
+            grouped = (
+                StudentScore.objects.filter(**{f"{subject}__isnull": False})
+                .values(bucket=Round(F(subject) * 100))
+                .annotate(count=Count('r_number'), score_sum=Sum(subject))
+                .order_by()
+            )
+            rows.extend(
+                self.model(subject=subject, bucket=int(row['bucket']), count=row['count'], score_sum=row['score_sum'])
+                for row in grouped
+            )
+
+        with transaction.atomic():
+            self.reset()
+            self.model.objects.bulk_create(rows, batch_size=1000)
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Mapping, Sequence, Tuple
 
-from scores.models import StudentScore
+from django.db import IntegrityError, connection, transaction
+
+from scores.models import CONTENT_FIELDS, StudentScore, compute_fingerprint
+from scores.snapshots import schedule_snapshot_rebuild
+
+from .dataset_version_repository import DatasetVersionRepository
+from .score_histogram_repository import ScoreHistogramRepository, score_values
+
+
+# Outcomes of :meth:`StudentScoreRepository.upsert_many`
+CREATED, UPDATED, UNCHANGED = 'created', 'updated', 'unchanged'
+# Classifications of an upsert batch before giving up on SBDs inserted concurrently
+UPSERT_ATTEMPTS = 3
 
 
 class StudentScoreRepository:
     def __init__(self):
         self.model = StudentScore
+        self.histogram = ScoreHistogramRepository()
+        self.dataset_version = DatasetVersionRepository()
 
     # ---------------------------------------------------------------------
     # READ operations
@@ -23,39 +37,150 @@ class StudentScoreRepository:
         except self.model.DoesNotExist:
             return None
 
-    # New aggregation helpers ---------------------------------------------
-    def aggregate_score_levels(self, subject: str) -> Dict[str, int]:
-        """Return counts of score levels for *subject* (non-null rows only)."""
-        from django.db.models import Count, Case, When, IntegerField, Q
-        qs = self.model.objects.filter(**{f"{subject}__isnull": False})
-        return qs.aggregate(
-            excellent=Count(Case(When(**{f"{subject}__gte": 8.0}, then=1), output_field=IntegerField())),
-            good=Count(Case(When(Q(**{f"{subject}__gte": 6.0}) & Q(**{f"{subject}__lt": 8.0}), then=1), output_field=IntegerField())),
-            average=Count(Case(When(Q(**{f"{subject}__gte": 4.0}) & Q(**{f"{subject}__lt": 6.0}), then=1), output_field=IntegerField())),
-            below_average=Count(Case(When(**{f"{subject}__lt": 4.0}, then=1), output_field=IntegerField())),
-            total_students=Count(subject)
-        )
-
-    def list_scores_for_subject(self, subject: str):
-        """Return a list of raw float scores for *subject* (non-null)."""
-        return list(
-            self.model.objects.filter(**{f"{subject}__isnull": False}).values_list(subject, flat=True)
-        )
+    def values_by_sbds(
+        self, sbds: Sequence[str], fields: Sequence[str], chunk_size: int = 500,
+    ) -> Iterator[Tuple[List[str], Dict[str, tuple]]]:
+        """Yield ``(chunk, {sbd: values})`` for *sbds*, one primary-key ``IN`` query per chunk.
+
+        Rows hold *fields* in order; SBDs without a row are absent from the
+        mapping.  Chunks keep the ``IN`` list under every backend's
+        parameter limit and only one chunk of rows is in memory at a time.
+        """
+        for start in range(0, len(sbds), chunk_size):
+            chunk = list(sbds[start:start + chunk_size])
+            rows = self.model.objects.filter(r_number__in=chunk).values_list('r_number', *fields)
+            yield chunk, {row[0]: row[1:] for row in rows}
+
+    def iter_values(self, fields: Sequence[str], condition=None, chunk_size: int = 2000) -> Iterator[tuple]:
+        """Stream *fields* of the rows matching *condition* in SBD order.
+
+        Uses ``iterator(chunk_size)``: a server-side cursor on PostgreSQL
+        and chunked fetches elsewhere, so no result set is materialized.
+        """
+        queryset = self.model.objects.order_by('r_number')
+        if condition is not None:
+            queryset = queryset.filter(condition)
+        return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
 
     # ---------------------------------------------------------------------
     # WRITE operations
     # ---------------------------------------------------------------------
+    # Every write also updates the score histogram and bumps the dataset version
+    # in the same transaction, then schedules a (debounced, background) rebuild
+    # of the columnar snapshot.
     def create(self, **data: Any) -> StudentScore:
         """Insert a new row and return the created :class:`StudentScore`."""
-        return self.model.objects.create(**data)
+        with transaction.atomic():
+            instance = self.model.objects.create(**data)
+            self.histogram.record_changes([(None, score_values(instance))])
+            self.dataset_version.bump()
+        schedule_snapshot_rebuild()
+        return instance
 
     def update(self, instance: StudentScore, **data: Any) -> StudentScore:
-        """Update *``instance``* in-place with *data* and **persist** it."""
-        for field, value in data.items():
-            setattr(instance, field, value)
-        instance.save(update_fields=list(data.keys()) or None)
+        """Update *``instance``* in-place with *data* and **persist** it.
+
+        Raises ``StudentScore.DoesNotExist`` if the row was deleted meanwhile.
+        """
+        # The primary key cannot be listed in ``update_fields`` (PUT sends it back)
+        update_fields = [field for field in data if field != self.model._meta.pk.name]
+        with transaction.atomic():
+            # Re-read under a row lock: concurrent writes of the same SBD take
+            # their histogram deltas one after the other, never from the same row
+            old = self._lock_content(instance.pk)
+            for field, value in {**old, **data}.items():
+                setattr(instance, field, value)
+            instance.save(update_fields=update_fields or None)
+            self.histogram.record_changes([(old, score_values(instance))])
+            self.dataset_version.bump()
+        schedule_snapshot_rebuild()
         return instance
 
     def delete(self, instance: StudentScore) -> None:
-        """Delete *``instance``* from the database."""
-        instance.delete()
\ No newline at end of file
+        """Delete *``instance``* from the database.
+
+        Raises ``StudentScore.DoesNotExist`` if the row was deleted meanwhile.
+        """
+        with transaction.atomic():
+            old = self._lock_content(instance.pk)
+            deleted, _ = self.model.objects.filter(pk=instance.pk).delete()
+            if not deleted:
+                raise self.model.DoesNotExist(f"StudentScore with id={instance.pk} no longer exists")
+            self.histogram.record_changes([(old, None)])
+            self.dataset_version.bump()
+        schedule_snapshot_rebuild()
+
+    def _lock_content(self, sbd: str) -> Dict[str, Any]:
+        """Lock the row of *sbd* for the current transaction and return its content fields."""
+        row = self.model.objects.select_for_update().filter(pk=sbd).values(*CONTENT_FIELDS).first()
+        if row is None:
+            raise self.model.DoesNotExist(f"StudentScore with id={sbd} no longer exists")
+        return row
+
+    def upsert_many(self, rows: Mapping[str, Mapping[str, Any]], chunk_size: int = 500) -> Dict[str, str]:
+        """Insert or update ``{sbd: fields}`` in one transaction; return ``{sbd: outcome}``.
+
+        Fields left out keep their stored value (the model default for a new
+        row), and rows whose content fingerprint is unchanged are not
+        written.  Existing rows are locked and rewritten with
+        ``bulk_create(update_conflicts=True)``; new rows are plainly inserted,
+        so an SBD inserted meanwhile by another transaction raises
+        ``IntegrityError`` and the batch is classified again against it.  The
+        histogram, dataset version and snapshot rebuild are handled once per batch.
+        """
+        sbds = sorted(rows)
+        with transaction.atomic():
+            for attempt in range(1, UPSERT_ATTEMPTS + 1):
+                try:
+                    with transaction.atomic():
+                        outcomes, changes = self._upsert_chunked(rows, sbds, chunk_size)
+                    break
+                except IntegrityError:
+                    if attempt == UPSERT_ATTEMPTS:
+                        raise
+            if changes:
+                self.histogram.record_changes(changes)
+                self.dataset_version.bump()
+        if changes:
+            schedule_snapshot_rebuild()
+        return outcomes
+
+    def _upsert_chunked(self, rows: Mapping[str, Mapping[str, Any]], sbds: List[str],
+                        chunk_size: int) -> Tuple[Dict[str, str], List[tuple]]:
+        """One attempt of :meth:`upsert_many`: return the outcomes and the histogram deltas."""
+        # Locked, so the histogram deltas are taken against the rows being replaced
+        stored = {}
+        for start in range(0, len(sbds), chunk_size):
+            stored.update(
+                (row['r_number'], row) for row in self.model.objects.select_for_update()
+                .filter(r_number__in=sbds[start:start + chunk_size]).values('r_number', *CONTENT_FIELDS)
+            )
+
+        outcomes: Dict[str, str] = {}
+        to_create, to_update, changes = [], [], []
+        for sbd in sbds:
+            old = stored.get(sbd)
+            instance = self.model(r_number=sbd, **{field: old[field] for field in CONTENT_FIELDS} if old else {})
+            for field, value in rows[sbd].items():
+                setattr(instance, field, value)
+            instance.fingerprint = compute_fingerprint(instance.__dict__)
+            if old is not None and compute_fingerprint(old) == instance.fingerprint:
+                outcomes[sbd] = UNCHANGED
+                continue
+            outcomes[sbd] = UPDATED if old else CREATED
+            (to_update if old else to_create).append(instance)
+            changes.append((old, score_values(instance)))
+
+        if to_create:
+            self.model.objects.bulk_create(to_create, batch_size=chunk_size)
+        if to_update:
+            self.model.objects.bulk_create(
+                to_update,
+                batch_size=chunk_size,
+                update_conflicts=True,
+                # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target
+                unique_fields=['r_number'] if connection.features.supports_update_conflicts_with_target else None,
+                # Content and fingerprint; the combination totals are generated
+                update_fields=[*CONTENT_FIELDS, 'fingerprint'],
+            )
+        return outcomes, changes
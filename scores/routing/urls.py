@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from scores.views import StudentScoreViewSet, ScoreReportView, TopStudentsGroupAView, DashboardViewSet
+from scores.views import StudentScoreViewSet, ScoreReportView, TopStudentsView, DashboardViewSet, CacheStatsViewSet
 
 router = DefaultRouter()
 router.register(r"scores", StudentScoreViewSet, basename="studentscore")
@@ -13,10 +13,14 @@ urlpatterns = [
     # Chart data endpoint (optimized for frontend charts)
     path('score-report/chart-data/', ScoreReportView.as_view({'get': 'score_chart_data'}), name='chart_data'),
 
-    path('top-students/group-a/', TopStudentsGroupAView.as_view({'get': 'get'}), name='top_students_group_a'),
+    # Rankings per subject combination (A00, A01, B00, ...); ``group-a`` is an alias of A00
+    path('top-students/<str:group>/', TopStudentsView.as_view({'get': 'get'}), name='top_students'),
 
     # Dashboard summary endpoint
     path('dashboard/summary/', DashboardViewSet.as_view({'get': 'summary'}), name='dashboard_summary'),
 
+    # Analytics cache counters of the worker answering the request
+    path('cache/stats/', CacheStatsViewSet.as_view({'get': 'stats'}), name='cache_stats'),
+
     path("", include(router.urls)),
 ]
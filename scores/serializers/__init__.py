@@ -1,3 +1,14 @@
+from .row_encoder import RowEncoder
+from .score_lookup_serializer import MAX_LOOKUP_SBDS, ScoreLookupSerializer
+from .score_upsert_serializer import MAX_UPSERT_ROWS, ScoreUpsertRowSerializer, ScoreUpsertSerializer
 from .student_score_serializer import StudentScoreSerializer
 
-__all__ = ['StudentScoreSerializer']
\ No newline at end of file
+__all__ = [
+    'MAX_LOOKUP_SBDS',
+    'MAX_UPSERT_ROWS',
+    'RowEncoder',
+    'ScoreLookupSerializer',
+    'ScoreUpsertRowSerializer',
+    'ScoreUpsertSerializer',
+    'StudentScoreSerializer',
+]
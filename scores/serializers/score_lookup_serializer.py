@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from scores.models import StudentScore
+
+# A school roster fits comfortably; larger batches should be split by the client
+MAX_LOOKUP_SBDS = 5000
+
+
+class ScoreLookupSerializer(serializers.Serializer):
+    """Body of ``POST /scores/lookup/``: the SBDs to fetch."""
+
+    sbds = serializers.ListField(
+        child=serializers.CharField(max_length=StudentScore._meta.get_field("r_number").max_length),
+        allow_empty=False,
+        max_length=MAX_LOOKUP_SBDS,
+    )
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from .student_score_serializer import StudentScoreSerializer
+
+# Correction batches are a few hundred rows; larger loads belong to import_scores
+MAX_UPSERT_ROWS = 1000
+
+
+class ScoreUpsertRowSerializer(StudentScoreSerializer):
+    """One row of ``POST /scores/bulk/``: an SBD plus the fields to set.
+
+    An existing SBD is not an error here, so the primary key's uniqueness
+    check (one query per row) is dropped.
+    """
+
+    class Meta(StudentScoreSerializer.Meta):
+        extra_kwargs = {**StudentScoreSerializer.Meta.extra_kwargs, "r_number": {"validators": []}}
+
+
+class ScoreUpsertSerializer(serializers.Serializer):
+    """Body of ``POST /scores/bulk/``; each row is validated on its own by :class:`ScoreUpsertRowSerializer`."""
+
+    rows = serializers.ListField(allow_empty=False, max_length=MAX_UPSERT_ROWS)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 
-from scores.models import StudentScore
+from scores.models import COMBINATION_FIELDS, SUBJECT_FIELDS, StudentScore
+
+# Exam scores are out of 10
+SCORE_LIMITS = {"min_value": 0, "max_value": 10}
 
 
 class StudentScoreSerializer(serializers.ModelSerializer):
@@ -8,4 +11,5 @@ class StudentScoreSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = StudentScore
-        fields = "__all__"
\ No newline at end of file
+        exclude = ["fingerprint", *COMBINATION_FIELDS]
+        extra_kwargs = {field: SCORE_LIMITS for field in SUBJECT_FIELDS}
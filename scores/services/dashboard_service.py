@@ -1,9 +1,7 @@
 from typing import Dict
 
-from django.db.models import Avg, Count, Case, When, IntegerField, Q
 from django.utils import timezone
 
-from scores.models import StudentScore
 from scores.services.student_score_report_service import ScoreReportService, SUBJECT_FIELDS
 
 
@@ -17,34 +15,19 @@ class DashboardService:
     # Public helpers
     # ------------------------------------------------------------------
     def summary(self) -> Dict:
-        """Return a dictionary with all statistics required by the dashboard."""
+        """Return a dictionary with all statistics required by the dashboard.
 
-        aggregation: dict[str, any] = {"total_students": Count("r_number")}
+        Everything is derived from the score histogram, not from ``StudentScore``.
+        """
+        score_service = self._score_report_service.student_score_service
+        aggregates = score_service.subject_aggregates(SUBJECT_FIELDS)
+        total_students = score_service.total_students()
 
-        for field in SUBJECT_FIELDS:
-            aggregation[f"avg_{field}"] = Avg(field)
-            aggregation[f"{field}_excellent"] = Count(
-                Case(When(**{f"{field}__gte": 8.0}, then=1), output_field=IntegerField())
-            )
-            aggregation[f"{field}_good"] = Count(
-                Case(
-                    When(Q(**{f"{field}__gte": 6.0}) & Q(**{f"{field}__lt": 8.0}), then=1),
-                    output_field=IntegerField(),
-                )
-            )
-            aggregation[f"{field}_average"] = Count(
-                Case(
-                    When(Q(**{f"{field}__gte": 4.0}) & Q(**{f"{field}__lt": 6.0}), then=1),
-                    output_field=IntegerField(),
-                )
-            )
-            aggregation[f"{field}_below"] = Count(
-                Case(When(**{f"{field}__lt": 4.0}, then=1), output_field=IntegerField())
-            )
-
-        stats = StudentScore.objects.aggregate(**aggregation)
-
-        total_students = stats["total_students"]
+        stats = {f"avg_{field}": aggregates[field].average for field in SUBJECT_FIELDS}
+        distribution = {"excellent": 0, "good": 0, "average": 0, "below_average": 0}
+        for aggregate in aggregates.values():
+            for level, count in aggregate.levels.items():
+                distribution[level] += count
 
         avg_per_subject_clean = {
             subject: round(stats.get(f"avg_{subject}") or 0, 2) for subject in SUBJECT_FIELDS
@@ -52,13 +35,6 @@ class DashboardService:
 
         overall_avg = round(sum(avg_per_subject_clean.values()) / len(SUBJECT_FIELDS), 2)
 
-        distribution = {
-            "excellent": sum(stats[f"{s}_excellent"] for s in SUBJECT_FIELDS),
-            "good": sum(stats[f"{s}_good"] for s in SUBJECT_FIELDS),
-            "average": sum(stats[f"{s}_average"] for s in SUBJECT_FIELDS),
-            "below_average": sum(stats[f"{s}_below"] for s in SUBJECT_FIELDS),
-        }
-
         return {
             "success": True,
             "data": {
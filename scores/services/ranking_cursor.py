@@ -0,0 +1,54 @@
+import base64
+import binascii
+import json
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RankingCursor:
+    """Opaque position in a combination ranking, handed out as ``next_cursor``.
+
+    ``rank`` is the rank of the last student returned, so numbering carries
+    on across pages, and ``version`` is the dataset version the page was
+    read from.  Cursors of the snapshot path point into the ranked rows;
+    cursors of the SQL path carry the ``(total, average, subject count,
+    r_number)`` key of the last row.
+    """
+
+    EXPIRED = 'Cursor has expired because the scores changed; start again from the first page'
+
+    group: str
+    min_subjects: int
+    rank: int
+    version: int = 0
+    position: Optional[int] = None
+    key: Optional[Tuple[float, float, int, str]] = None
+
+    def encode(self) -> str:
+        data = {name: value for name, value in asdict(self).items() if value is not None}
+        raw = json.dumps(data, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, value: str) -> 'RankingCursor':
+        """Parse a cursor string; raise ``ValueError`` if it is malformed."""
+        try:
+            data = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+            cursor = cls(**data)
+        except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError):
+            raise ValueError('Invalid cursor')
+        if cursor.key is not None:
+            if len(cursor.key) != 4:
+                raise ValueError('Invalid cursor')
+            cursor = cls(**{**data, 'key': tuple(cursor.key)})
+        if cursor.position is None and cursor.key is None:
+            raise ValueError('Invalid cursor')
+        return cursor
+
+    def check(self, group: str, min_subjects: int, version: int) -> None:
+        """Raise ``ValueError`` unless the cursor belongs to this ranking and dataset version."""
+        if self.group != group or self.min_subjects != min_subjects:
+            raise ValueError('Cursor does not match the requested ranking')
+        if self.version != version:
+            raise ValueError(self.EXPIRED)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+MAX_PERCENTILES = 20
+
+
+def parse_percentiles(value: str | None) -> Tuple[float, ...]:
+    """Parse a ``percentiles=10,50,90`` query value; raise ``ValueError`` if invalid."""
+    if not value:
+        return DEFAULT_PERCENTILES
+    try:
+        percentiles = tuple(float(part) for part in value.split(',') if part.strip())
+    except ValueError:
+        raise ValueError(f'Invalid percentiles "{value}"')
+    if not percentiles or len(percentiles) > MAX_PERCENTILES:
+        raise ValueError(f'Between 1 and {MAX_PERCENTILES} percentiles are allowed')
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise ValueError('Percentiles must be between 0 and 100')
+    return percentiles
+
+
+def histogram_statistics(buckets: Iterable[Tuple[int, int, float]],
+                         percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict:
+    """Summary statistics of one subject from its ``(bucket, count, score_sum)`` rows.
+
+    Works on the per-bucket arrays only, so memory does not grow with the
+    number of students.  Percentiles use linear interpolation between ranks,
+    i.e. they equal :func:`numpy.percentile` over the individual scores.
+    """
+    rows = np.array([(bucket, count) for bucket, count, _ in buckets], dtype=np.int64).reshape(-1, 2)
+    rows = rows[rows[:, 1] > 0]
+    rows = rows[np.argsort(rows[:, 0])]
+    values = rows[:, 0] / 100
+    counts = rows[:, 1]
+    total = int(counts.sum())
+    if not total:
+        raise ValueError('No scores to summarise')
+
+    mean = float(np.dot(values, counts) / total)
+    variance = float(np.dot((values - mean) ** 2, counts) / total)
+
+    return {
+        'count': total,
+        'mean': mean,
+        'std_dev': variance ** 0.5,
+        'min': float(values[0]),
+        'max': float(values[-1]),
+        'median': _percentiles(values, counts, [50])[0],
+        'mode': float(values[np.argmax(counts)]),
+        'percentiles': dict(zip(_percentile_labels(percentiles), _percentiles(values, counts, percentiles))),
+    }
+
+
+def _percentiles(values: np.ndarray, counts: np.ndarray, percentiles: Sequence[float]) -> List[float]:
+    # Rank ``k`` (0-based) lies in the first bucket whose cumulative count exceeds it
+    cumulative = np.cumsum(counts)
+    positions = (cumulative[-1] - 1) * np.asarray(percentiles, dtype=np.float64) / 100
+    lower = np.floor(positions)
+    lower_values = values[np.searchsorted(cumulative, lower, side='right')]
+    upper_values = values[np.searchsorted(cumulative, np.ceil(positions), side='right')]
+    return (lower_values + (upper_values - lower_values) * (positions - lower)).tolist()
+
+
+def _percentile_labels(percentiles: Sequence[float]) -> List[str]:
+    return [f"p{p:g}" for p in percentiles]
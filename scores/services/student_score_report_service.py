@@ -1,5 +1,6 @@
 from django.utils import timezone
 
+from scores.services.score_statistics import DEFAULT_PERCENTILES, histogram_statistics
 from scores.services.student_score_service import StudentScoreService
 
 SUBJECT_FIELDS = [
@@ -50,10 +51,10 @@ class ScoreReportService:
     def generate_score_report(self) -> dict:
         """Compute statistics for all subjects and return serialized-ready dict."""
         report_data: list[dict] = []
-
+        aggregates = self.student_score_service.subject_aggregates(SUBJECT_FIELDS)
 
         for field in SUBJECT_FIELDS:
-            subject_stats = self.student_score_service.score_level_counts(field)
+            subject_stats = aggregates[field].level_counts()
 
             report_data.append({
                 'subject': field,
@@ -83,22 +84,24 @@ class ScoreReportService:
             }
         }
 
-    def get_subject_detail(self, subject: str) -> dict:
-        """Return detailed statistics for a given subject."""
+    def get_subject_detail(self, subject: str, percentiles=DEFAULT_PERCENTILES) -> dict:
+        """Return detailed statistics for a given subject.
+
+        Computed from the subject's score histogram, so the cost does not
+        depend on the number of students.
+        """
         if subject not in SUBJECT_FIELDS:
             raise ValueError(f'Invalid subject "{subject}"')
 
-        scores = self.student_score_service.raw_scores(subject)
-        if not scores:
+        aggregate = self.student_score_service.subject_aggregates([subject])[subject]
+        if not aggregate.count:
             raise ValueError(f'No scores found for subject: {subject}')
 
-        excellent = len([s for s in scores if s >= 8.0])
-        good = len([s for s in scores if 6.0 <= s < 8.0])
-        average = len([s for s in scores if 4.0 <= s < 6.0])
-        below_average = len([s for s in scores if s < 4.0])
-
-        total_students = len(scores)
-        avg_score = sum(scores) / total_students
+        stats = histogram_statistics(
+            self.student_score_service.score_histogram([subject]).get(subject, []), percentiles
+        )
+        levels = aggregate.levels
+        total_students = aggregate.count
 
         return {
             'success': True,
@@ -106,21 +109,25 @@ class ScoreReportService:
                 'subject': subject,
                 'total_students': total_students,
                 'score_distribution': {
-                    'excellent': excellent,
-                    'good': good,
-                    'average': average,
-                    'below_average': below_average
+                    'excellent': levels['excellent'],
+                    'good': levels['good'],
+                    'average': levels['average'],
+                    'below_average': levels['below_average']
                 },
                 'percentages': {
-                    'excellent': round((excellent / total_students * 100), 2),
-                    'good': round((good / total_students * 100), 2),
-                    'average': round((average / total_students * 100), 2),
-                    'below_average': round((below_average / total_students * 100), 2)
+                    'excellent': round((levels['excellent'] / total_students * 100), 2),
+                    'good': round((levels['good'] / total_students * 100), 2),
+                    'average': round((levels['average'] / total_students * 100), 2),
+                    'below_average': round((levels['below_average'] / total_students * 100), 2)
                 },
                 'statistics': {
-                    'average_score': round(avg_score, 2),
-                    'highest_score': max(scores),
-                    'lowest_score': min(scores)
+                    'average_score': round(aggregate.average, 2),
+                    'highest_score': aggregate.max_score,
+                    'lowest_score': aggregate.min_score,
+                    'median': round(stats['median'], 2),
+                    'std_dev': round(stats['std_dev'], 2),
+                    'mode': stats['mode'],
+                    'percentiles': {label: round(value, 2) for label, value in stats['percentiles'].items()}
                 }
             }
         }
@@ -161,9 +168,9 @@ class ScoreReportService:
             ]
         }
 
-
+        aggregates = self.student_score_service.subject_aggregates(SUBJECT_FIELDS)
         for field in SUBJECT_FIELDS:
-            stats = self.student_score_service.score_level_counts(field)
+            stats = aggregates[field].levels
             chart_data['datasets'][0]['data'].append(stats['excellent'])
             chart_data['datasets'][1]['data'].append(stats['good'])
             chart_data['datasets'][2]['data'].append(stats['average'])
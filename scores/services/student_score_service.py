@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
 
 from rest_framework.exceptions import NotFound
 
+from scores.caching import single_flight
+from scores.exporters import ExportFilter, ScoreExport
 from scores.models import StudentScore
-from scores.repositories import StudentScoreRepository
+from scores.repositories import ScoreHistogramRepository, StudentScoreRepository
 
 
 class StudentScoreService:
@@ -16,6 +18,7 @@ class StudentScoreService:
     """
     def __init__(self):
         self.repo = StudentScoreRepository()
+        self.histogram_repo = ScoreHistogramRepository()
 
     # ------------------------------------------------------------------
     # Query helpers
@@ -29,6 +32,17 @@ class StudentScoreService:
             raise NotFound(detail=f"StudentScore with id={sbd} not found")
         return student
 
+    def lookup(self, sbds: Sequence[str], fields: Sequence[str]) -> Iterator[Tuple[str, Optional[tuple]]]:
+        """Yield ``(sbd, values or None)`` for each distinct SBD, in request order."""
+        for chunk, rows in self.repo.values_by_sbds(list(dict.fromkeys(sbds)), fields):
+            for sbd in chunk:
+                yield sbd, rows.get(sbd)
+
+    def export(self, export: ScoreExport, filters: Optional[ExportFilter] = None) -> Iterator[bytes]:
+        """Encoded chunks of every row passing *filters*, in the format of *export*."""
+        condition = filters.q() if filters else None
+        return export.encode(self.repo.iter_values(export.fields, condition, export.chunk_size))
+
     # ------------------------------------------------------------------
     # Mutation helpers
     # ------------------------------------------------------------------
@@ -37,17 +51,50 @@ class StudentScoreService:
 
     def update(self, sbd: str, data: Dict[str, Any]) -> StudentScore:
         instance = self.retrieve(sbd)
-        return self.repo.update(instance, **data)
+        try:
+            return self.repo.update(instance, **data)
+        except StudentScore.DoesNotExist:
+            raise NotFound(detail=f"StudentScore with id={sbd} not found")
+
+    def upsert_many(self, rows: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+        """Apply validated rows (each with its ``r_number``) as one batch; return ``{sbd: outcome}``.
+
+        A later row for the same SBD overrides the fields of an earlier one.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            row = dict(row)
+            merged.setdefault(row.pop('r_number'), {}).update(row)
+        return self.repo.upsert_many(merged)
 
     def delete(self, sbd: str) -> None:
         instance = self.retrieve(sbd)
-        self.repo.delete(instance)
+        try:
+            self.repo.delete(instance)
+        except StudentScore.DoesNotExist:
+            raise NotFound(detail=f"StudentScore with id={sbd} not found")
 
     # New reuse helpers ------------------------------------------------
     def score_level_counts(self, subject: str):
-        """Wrapper for repository.aggregate_score_levels."""
-        return self.repo.aggregate_score_levels(subject)
+        """Score level counts for *subject*, read from the score histogram."""
+        return self.histogram_repo.level_counts(subject)
+
+    def subject_aggregates(self, subjects=None):
+        """Return ``{subject: SubjectAggregate}`` (counts, sums, min/max, levels) in one pass."""
+        return self.histogram_repo.aggregate_subjects(subjects)
+
+    def score_histogram(self, subjects=None):
+        """Return ``{subject: [(bucket, count, score_sum), ...]}`` from the score histogram."""
+        return self.histogram_repo.subject_buckets(subjects)
+
+    def total_students(self) -> int:
+        return self.histogram_repo.row_count()
+
+    def count(self) -> int:
+        """Number of students, from the score histogram, cached per dataset version.
 
-    def raw_scores(self, subject: str):
-        """Return list[float] of scores for *subject* (non-null)."""
-        return self.repo.list_scores_for_subject(subject)
\ No newline at end of file
+        Pagination never runs ``COUNT(*)`` on the table.  The count goes into
+        pages validated by the current version's ETag, so a count of an
+        older version is never served.
+        """
+        return single_flight().get('score_count', (), self.total_students, serve_stale=False)
\ No newline at end of file
@@ -0,0 +1,109 @@
+from typing import Optional
+
+import numpy as np
+from django.db.models import Count, F, Q
+from django.db.models.functions import Round
+
+from scores.models import COMBINATIONS, Combination, score_bucket
+from scores.repositories import DatasetVersionRepository
+from scores.services.student_score_report_service import SUBJECT_FIELDS
+from scores.services.student_score_service import StudentScoreService
+from scores.snapshots import current_snapshot
+
+
+def _standing(below: int, equal: int, count: int) -> dict:
+    """Rank and percentile rank from the counts of lower and equal scores.
+
+    ``rank`` is 1 + the number of higher scores (ties share a rank);
+    ``percentile`` is the share of lower scores plus half of the ties.
+    """
+    return {
+        'rank': count - below - equal + 1,
+        'percentile': round((below + equal / 2) / count * 100, 2),
+        'total_students': count,
+    }
+
+
+class StudentStandingService:
+    """Where one student stands in every subject and in every combination total.
+
+    Subjects are answered from the cumulative counts of the score histogram
+    and combinations from the sorted totals stored in the score snapshot,
+    so every lookup is a binary search.  Between a write and the rebuild it
+    schedules, the snapshot misses that write; ``provisional`` is then set
+    and the combination standings are off by at most the rows written since.
+    """
+
+    def __init__(self):
+        self.score_service = StudentScoreService()
+        self.dataset_version = DatasetVersionRepository()
+        self.provisional = False
+
+    def standing(self, sbd: str) -> dict:
+        student = self.score_service.retrieve(sbd)
+        histogram = self.score_service.score_histogram(SUBJECT_FIELDS)
+
+        subjects = {}
+        for subject in SUBJECT_FIELDS:
+            score = getattr(student, subject)
+            if score is None:
+                subjects[subject] = None
+                continue
+            subjects[subject] = {'score': score, **self._subject_standing(histogram.get(subject, []), score)}
+
+        return {
+            'success': True,
+            'data': {
+                'r_number': student.r_number,
+                'subjects': subjects,
+                'combinations': {
+                    code: self._combination_standing(combination, student)
+                    for code, combination in COMBINATIONS.items()
+                },
+            }
+        }
+
+    def _subject_standing(self, buckets, score: float) -> dict:
+        buckets = np.array([(bucket, count) for bucket, count, _ in buckets], dtype=np.int64).reshape(-1, 2)
+        cumulative = np.cumsum(buckets[:, 1])
+        bucket = score_bucket(score)
+        # Histogram rows are ordered by bucket
+        lower_end = int(np.searchsorted(buckets[:, 0], bucket, side='left'))
+        upper_end = int(np.searchsorted(buckets[:, 0], bucket, side='right'))
+        below = int(cumulative[lower_end - 1]) if lower_end else 0
+        not_above = int(cumulative[upper_end - 1]) if upper_end else 0
+        return _standing(below, not_above - below, int(cumulative[-1]))
+
+    def _combination_standing(self, combination: Combination, student) -> Optional[dict]:
+        """Standing of a combination total among students who sat all of its subjects."""
+        scores = [getattr(student, subject) for subject in combination.subjects]
+        if any(score is None for score in scores) or not all(
+            combination.counts_subject(subject, student.foreign_lang_code) for subject in combination.subjects
+        ):
+            return None
+        total = sum(score_bucket(score) for score in scores)
+
+        snapshot = current_snapshot()
+        counts = snapshot.total_standing(combination.code, total) if snapshot is not None else None
+        if counts is None:
+            counts = self._combination_counts_from_database(combination, total)
+        elif snapshot.dataset_version != self.dataset_version.current():
+            self.provisional = True
+
+        return {'total_score': round(total / 100, 2), **_standing(*counts)}
+
+    def _combination_counts_from_database(self, combination: Combination, total: int):
+        # Fallback before any snapshot was built: one aggregate over the complete rows
+        complete = {combination.count_field: len(combination.subjects)}
+        total_expr = Round(F(combination.total_field) * 100)
+        stats = (
+            self.score_service.list_scores()
+            .filter(**complete)
+            .annotate(combination_total=total_expr)
+            .aggregate(
+                below=Count('r_number', filter=Q(combination_total__lt=total)),
+                equal=Count('r_number', filter=Q(combination_total=total)),
+                count=Count('r_number'),
+            )
+        )
+        return stats['below'], stats['equal'], stats['count']
@@ -1,94 +1,166 @@
 from typing import List, Optional
 
-from django.db.models import Q, F, Case, When, FloatField, IntegerField, Sum, Count, Min, Max, Avg
-from django.db.models.functions import Coalesce
+import numpy as np
+from django.db.models import Q, F, Count, Min, Max, Avg
 
+from scores.models import Combination, get_combination
+from scores.repositories import DatasetVersionRepository
+from scores.services.ranking_cursor import RankingCursor
+from scores.services.student_score_report_service import SUBJECT_NAMES
 from scores.services.student_score_service import StudentScoreService
+from scores.snapshots import ScoreSnapshot, current_snapshot
+
+# Ranked rows examined per step when walking a precomputed ranking
+ORDER_CHUNK = 1024
+# Students per page; further pages are reached with ``next_cursor``
+MAX_PAGE_SIZE = 50
+# Criteria the former Group A endpoint reported, kept for requests through its alias
+LEGACY_CRITERIA = {
+    'GROUP-A': {'group': 'A', 'ranking_method': 'Total score in Group A subjects'},
+}
 
-GROUP_A_SUBJECTS = ['math', 'physics', 'chemistry']
 
 class TopStudentScoreService:
     def __init__(self):
         self.score_service = StudentScoreService()
+        self.dataset_version = DatasetVersionRepository()
 
-    def rank_group_a_students(
+    def rank_students(
         self,
+        group: str,
         limit: int = 10,
         min_subjects: int = 2,
+        cursor: Optional[str] = None,
     ) -> dict:
-        """Return ranking data and summary for Group A students.
+        """Return one page of the ranking and the summary for a subject combination (e.g. ``A00``).
+
+        *group* may be an alias such as ``group-a``, which keeps the criteria
+        of the endpoint it replaced.
 
-        Optimized version using database aggregation to handle large datasets efficiently.
+        Served from the precomputed per-combination ranking of the current
+        snapshot when there is one, otherwise from a single SQL query.  Pages
+        are keyset-paginated: pass the ``next_cursor`` of a page as *cursor*
+        to get the next one at the same cost as the first.  Raises
+        ``ValueError`` for an unknown combination or an invalid or expired cursor.
         """
+        combination = get_combination(group)
+        if combination is None:
+            raise ValueError(f'Unknown combination "{group}"')
 
-        limit = min(limit, 50)
+        limit = max(min(limit, MAX_PAGE_SIZE), 1)
 
-        # Use database-level aggregation to calculate totals and counts
-        students_qs = (
-            self.score_service
-            .list_scores()
-            .filter(
-                Q(math__isnull=False)
-                | Q(physics__isnull=False)
-                | Q(chemistry__isnull=False)
-            )
-            .exclude(
-                math__isnull=True,
-                physics__isnull=True,
-                chemistry__isnull=True,
+        version = self.dataset_version.current()
+        snapshot = current_snapshot()
+        # A snapshot behind the latest writes (its rebuild is pending) is not used
+        if snapshot is None or snapshot.dataset_version != version or snapshot.ranking_order(combination.code) is None:
+            snapshot = None
+        after = None
+        if cursor:
+            after = RankingCursor.decode(cursor)
+            after.check(combination.code, min_subjects, version)
+            if after.key is not None:
+                # Issued by the SQL path; the database still holds the same data
+                snapshot = None
+            elif snapshot is None:
+                raise ValueError(RankingCursor.EXPIRED)
+
+        if snapshot is not None:
+            top_students, next_cursor = self._rank_from_snapshot(
+                snapshot, combination, limit, min_subjects, version, after
             )
-            .annotate(
-                # Count non-null subjects
-                subjects_count=Sum(
-                    Case(
-                        When(math__isnull=False, then=1),
-                        default=0,
-                        output_field=IntegerField()
-                    ) +
-                    Case(
-                        When(physics__isnull=False, then=1),
-                        default=0,
-                        output_field=IntegerField()
-                    ) +
-                    Case(
-                        When(chemistry__isnull=False, then=1),
-                        default=0,
-                        output_field=IntegerField()
+            all_students_stats = snapshot.ranking_summary(combination.code, min_subjects)
+        else:
+            top_students, next_cursor = self._rank_from_database(combination, limit, min_subjects, version, after)
+            all_students_stats = None
+
+        summary = self._calculate_summary(combination, min_subjects, top_students, all_students_stats)
+        response = self._ranking_response(combination, top_students, summary, min_subjects, limit)
+        response['data']['criteria'].update(LEGACY_CRITERIA.get(group.upper(), {}))
+        response['data']['next_cursor'] = next_cursor.encode() if next_cursor else None
+        return response
+
+    def _ranking_response(self, combination: Combination, top_students: List[dict], summary: dict,
+                          min_subjects: int, limit: int) -> dict:
+        return {
+            'success': True,
+            'data': {
+                'top_students': top_students,
+                'summary': summary,
+                'criteria': {
+                    'group': combination.code,
+                    'subjects': [SUBJECT_NAMES[subject] for subject in combination.subjects],
+                    'foreign_lang_code': combination.foreign_lang_code,
+                    'ranking_method': f'Total score in {combination.code} subjects',
+                    'minimum_subjects': min_subjects,
+                    'limit': limit
+                }
+            }
+        }
+
+    def _rank_from_snapshot(self, snapshot: ScoreSnapshot, combination: Combination, limit: int,
+                            min_subjects: int, version: int, after: Optional[RankingCursor] = None):
+        """Take the next *limit* eligible rows of the precomputed ranking.
+
+        The ranking is stored best first, so only rows with fewer than
+        *min_subjects* subjects have to be skipped on the way.  The cursor is
+        a position in the ranking; snapshots of one dataset version hold the
+        same ranking.
+        Returns the page and the cursor of the next one (*None* on the last page).
+        """
+        order = snapshot.ranking_order(combination.code)
+        start_rank = after.rank if after else 0
+        top_students = []
+        for start in range(after.position if after else 0, len(order), ORDER_CHUNK):
+            rows = np.asarray(order[start:start + ORDER_CHUNK])
+            totals, counts = snapshot.combination_totals(combination, rows)
+            for offset, (row, total, count) in enumerate(zip(rows, totals, counts)):
+                if count < min_subjects:
+                    continue
+                if len(top_students) == limit:
+                    # There is at least one more eligible row
+                    return top_students, RankingCursor(
+                        combination.code, min_subjects, start_rank + limit,
+                        version=version, position=start + offset,
                     )
-                ),
-                # Calculate total score (sum of non-null values)
-                total_score=Sum(
-                    Coalesce('math', 0.0) +
-                    Coalesce('physics', 0.0) +
-                    Coalesce('chemistry', 0.0)
-                ),
-                # Calculate average score
-                average_score=Case(
-                    When(subjects_count__gt=0, then=F('total_score') / F('subjects_count')),
-                    default=0.0,
-                    output_field=FloatField()
-                )
-            )
-            .filter(subjects_count__gte=min_subjects)  # Filter by minimum subjects
-            .order_by('-total_score', '-average_score', '-subjects_count')  # Order by ranking criteria
-            .values(
-                'r_number', 'math', 'physics', 'chemistry', 'foreign_lang_code',
+                row = int(row)
+                lang_code = snapshot.foreign_lang_code(row)
+                scores = {
+                    subject: snapshot.score(subject, row) for subject in combination.subjects
+                    if combination.counts_subject(subject, lang_code)
+                }
+                top_students.append({
+                    'rank': start_rank + len(top_students) + 1,
+                    'r_number': snapshot.sbd[row].decode(),
+                    'subject_scores': {subject: score for subject, score in scores.items() if score is not None},
+                    'total_score': round(float(total) / 100, 2),
+                    'average_score': round(float(total) / int(count) / 100, 2),
+                    'subjects_count': int(count),
+                    'foreign_lang_code': lang_code,
+                })
+        return top_students, None
+
+    def _rank_from_database(self, combination: Combination, limit: int, min_subjects: int, version: int,
+                            after: Optional[RankingCursor] = None):
+        """Read the next *limit* rows in index order, starting after the cursor key."""
+        students_qs = self.ranking_queryset(combination, min_subjects)
+        if after is not None:
+            students_qs = students_qs.filter(self._after_key(combination, after.key))
+        # One extra row tells whether there is a next page
+        students = list(
+            students_qs.values(
+                'r_number', *combination.subjects, 'foreign_lang_code',
                 'subjects_count', 'total_score', 'average_score'
-            )[:limit]  # Limit results at database level
+            )[:limit + 1]  # Limit results at database level
         )
 
-        # Convert to list and add ranking
+        start_rank = after.rank if after else 0
         top_students = []
-        for i, student in enumerate(students_qs, 1):
-            # Build subject scores dict
-            subject_scores = {}
-            if student['math'] is not None:
-                subject_scores['math'] = student['math']
-            if student['physics'] is not None:
-                subject_scores['physics'] = student['physics']
-            if student['chemistry'] is not None:
-                subject_scores['chemistry'] = student['chemistry']
-
+        for i, student in enumerate(students[:limit], start_rank + 1):
+            subject_scores = {
+                subject: student[subject] for subject in combination.subjects
+                if student[subject] is not None
+                and combination.counts_subject(subject, student['foreign_lang_code'])
+            }
             top_students.append({
                 'rank': i,
                 'r_number': student['r_number'],
@@ -99,68 +171,59 @@ class TopStudentScoreService:
                 'foreign_lang_code': student['foreign_lang_code'] or ''
             })
 
-        # Get summary statistics using a separate optimized query
-        summary = self._calculate_group_a_summary_optimized(min_subjects, top_students)
+        if len(students) <= limit:
+            return top_students, None
+        last = students[limit - 1]
+        return top_students, RankingCursor(
+            combination.code, min_subjects, start_rank + limit, version=version,
+            key=(last['total_score'], last['average_score'], last['subjects_count'], last['r_number']),
+        )
+
+    @staticmethod
+    def _after_key(combination: Combination, key) -> Q:
+        """Rows ranked after *key* in ``(total DESC, average DESC, count DESC, r_number)`` order.
 
-        return {
-            'success': True,
-            'data': {
-                'top_students': top_students,
-                'summary': summary,
-                'criteria': {
-                    'group': 'A',
-                    'subjects': ['Mathematics', 'Physics', 'Chemistry'],
-                    'ranking_method': 'Total score in Group A subjects',
-                    'minimum_subjects': min_subjects,
-                    'limit': limit
-                }
-            }
-        }
+        The leading ``total <= key`` lets the database start the index scan at the key.
+        """
+        total, average, count, r_number = key
+        total_field, average_field, count_field = (
+            combination.total_field, combination.average_field, combination.count_field
+        )
+        return Q(**{f'{total_field}__lte': total}) & (
+            Q(**{f'{total_field}__lt': total})
+            | Q(**{total_field: total, f'{average_field}__lt': average})
+            | Q(**{total_field: total, average_field: average, f'{count_field}__lt': count})
+            | Q(**{total_field: total, average_field: average, count_field: count, 'r_number__gt': r_number})
+        )
+
+    def ranking_queryset(self, combination: Combination, min_subjects: int):
+        """Students with at least *min_subjects* subjects of *combination*, best first.
 
-    def _calculate_group_a_summary_optimized(self, min_subjects: int, top_students: List[dict]) -> dict:
-        """Calculate summary statistics using database aggregation for better performance."""
-        
-        # Get all students statistics with database aggregation
-        all_students_stats = (
+        The totals are stored generated columns covered by a descending index,
+        so ordering by them and taking the first rows is an index range read.
+        """
+        return (
             self.score_service
             .list_scores()
-            .filter(
-                Q(math__isnull=False)
-                | Q(physics__isnull=False)
-                | Q(chemistry__isnull=False)
-            )
-            .exclude(
-                math__isnull=True,
-                physics__isnull=True,
-                chemistry__isnull=True,
-            )
+            .filter(**{f'{combination.count_field}__gte': max(min_subjects, 1)})
             .annotate(
-                subjects_count=Sum(
-                    Case(When(math__isnull=False, then=1), default=0, output_field=IntegerField()) +
-                    Case(When(physics__isnull=False, then=1), default=0, output_field=IntegerField()) +
-                    Case(When(chemistry__isnull=False, then=1), default=0, output_field=IntegerField())
-                ),
-                total_score=Sum(
-                    Coalesce('math', 0.0) +
-                    Coalesce('physics', 0.0) +
-                    Coalesce('chemistry', 0.0)
-                ),
-                average_score=Case(
-                    When(subjects_count__gt=0, then=F('total_score') / F('subjects_count')),
-                    default=0.0,
-                    output_field=FloatField()
-                )
-            )
-            .filter(subjects_count__gte=min_subjects)
-            .aggregate(
-                total_students=Count('r_number'),
-                highest_total=Max('total_score'),
-                lowest_total=Min('total_score'),
-                average_total=Avg('total_score'),
-                average_score_mean=Avg('average_score')
+                subjects_count=F(combination.count_field),
+                total_score=F(combination.total_field),
+                average_score=F(combination.average_field),
             )
+            .order_by('-total_score', '-average_score', '-subjects_count', 'r_number')
         )
 
+    def _calculate_summary(self, combination: Combination, min_subjects: int, top_students: List[dict],
+                           all_students_stats: Optional[dict] = None) -> dict:
+        """Calculate summary statistics using database aggregation for better performance.
+
+        *all_students_stats* skips the database query when the caller already
+        has them (precomputed in the snapshot).
+        """
+        if all_students_stats is None:
+            all_students_stats = self._combination_totals(combination, min_subjects)
+
         # Calculate top students statistics from the already fetched data
         top_count = len(top_students)
         if top_students:
@@ -180,8 +243,8 @@ class TopStudentScoreService:
                 'average_score_mean': 0
             }
 
-        return {
-            'total_group_a_students': all_students_stats['total_students'] or 0,
+        summary = {
+            'total_students': all_students_stats['total_students'] or 0,
             'top_students_count': top_count,
             'all_students_stats': {
                 'highest_total': round(all_students_stats['highest_total'] or 0, 2),
@@ -191,29 +254,16 @@ class TopStudentScoreService:
             },
             'top_students_stats': top_students_stats
         }
+        if combination.code == 'A00':
+            # Name used by the former Group A endpoint
+            summary['total_group_a_students'] = summary['total_students']
+        return summary
 
-    def _calculate_group_a_summary(self, all_students, top_students):
-        if not all_students:
-            return {}
-        total_students = len(all_students)
-        top_count = len(top_students)
-        all_total_scores = [s['total_score'] for s in all_students]
-        all_average_scores = [s['average_score'] for s in all_students]
-        top_total_scores = [s['total_score'] for s in top_students]
-        top_average_scores = [s['average_score'] for s in top_students]
-        return {
-            'total_group_a_students': total_students,
-            'top_students_count': top_count,
-            'all_students_stats': {
-                'highest_total': max(all_total_scores),
-                'lowest_total': min(all_total_scores),
-                'average_total': round(sum(all_total_scores) / len(all_total_scores), 2),
-                'average_score_mean': round(sum(all_average_scores) / len(all_average_scores), 2)
-            },
-            'top_students_stats': {
-                'highest_total': max(top_total_scores) if top_total_scores else 0,
-                'lowest_total': min(top_total_scores) if top_total_scores else 0,
-                'average_total': round(sum(top_total_scores) / len(top_total_scores), 2) if top_total_scores else 0,
-                'average_score_mean': round(sum(top_average_scores) / len(top_average_scores), 2) if top_average_scores else 0
-            }
-        }
\ No newline at end of file
+    def _combination_totals(self, combination: Combination, min_subjects: int) -> dict:
+        return self.ranking_queryset(combination, min_subjects).aggregate(
+            total_students=Count('r_number'),
+            highest_total=Max('total_score'),
+            lowest_total=Min('total_score'),
+            average_total=Avg('total_score'),
+            average_score_mean=Avg('average_score')
+        )
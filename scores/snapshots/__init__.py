@@ -0,0 +1,12 @@
+from .builder import build_snapshot, read_columns
+from .refresher import schedule_snapshot_rebuild
+from .store import ScoreSnapshot, current_snapshot, invalidate_snapshot
+
+__all__ = [
+    'ScoreSnapshot',
+    'build_snapshot',
+    'current_snapshot',
+    'invalidate_snapshot',
+    'read_columns',
+    'schedule_snapshot_rebuild',
+]
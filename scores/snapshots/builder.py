@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scores.models import COMBINATIONS, SUBJECT_FIELDS, StudentScore
+
+from .store import ScoreSnapshot, combination_totals, write_snapshot
+
+CHUNK_ROWS = 100_000
+
+
+def build_snapshot(root: Optional[Path] = None) -> ScoreSnapshot:
+    """Dump ``StudentScore`` into a new columnar snapshot and publish it."""
+    # Imported here: the repositories import this package
+    from scores.repositories import DatasetVersionRepository
+
+    # Read first, so the snapshot never claims a newer version than its rows
+    dataset_version = DatasetVersionRepository().current()
+    sbd, scores, codes, code_labels = read_columns()
+    rankings, orders, summaries = _combination_rankings(scores, codes, code_labels)
+
+    return write_snapshot(
+        scores, sbd, codes, code_labels,
+        rankings=rankings, orders=orders, summaries=summaries, dataset_version=dataset_version, root=root,
+    )
+
+
+def read_columns() -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray, List[str]]:
+    """Read ``StudentScore`` into ``(sbd, {subject: float32 scores}, codes, code labels)``.
+
+    Rows are streamed in chunks and converted to arrays chunk by chunk, then
+    sorted by SBD (byte order, independent of the database collation).
+    Missing scores are ``NaN``; ``foreign_lang_code`` is dictionary-encoded
+    as indexes into the sorted labels, where ``''`` means no code.
+    """
+    fields = ['r_number', *SUBJECT_FIELDS, 'foreign_lang_code']
+    sbd_chunks, code_chunks = [], []
+    score_chunks = {subject: [] for subject in SUBJECT_FIELDS}
+
+    rows = StudentScore.objects.values_list(*fields).iterator(chunk_size=10_000)
+    while True:
+        chunk = [row for _, row in zip(range(CHUNK_ROWS), rows)]
+        if not chunk:
+            break
+        columns = list(zip(*chunk))
+        sbd_chunks.append(np.array(columns[0], dtype='S20'))
+        for index, subject in enumerate(SUBJECT_FIELDS, start=1):
+            # ``None`` becomes NaN in a float array
+            score_chunks[subject].append(np.array(columns[index], dtype=np.float64).astype(np.float32))
+        code_chunks.append(np.array([code or '' for code in columns[-1]], dtype=str))
+
+    sbd = np.concatenate(sbd_chunks) if sbd_chunks else np.empty(0, dtype='S20')
+    order = np.argsort(sbd, kind='stable')
+    scores = {
+        subject: (np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32))[order]
+        for subject, chunks in score_chunks.items()
+    }
+
+    all_codes = np.concatenate(code_chunks) if code_chunks else np.empty(0, dtype=str)
+    labels, codes = np.unique(all_codes, return_inverse=True)
+    code_dtype = np.uint8 if len(labels) <= 256 else np.uint16
+
+    codes = codes.astype(code_dtype)[order]
+    code_labels = [str(label) for label in labels]
+    return sbd[order], scores, codes, code_labels
+
+
+def _combination_rankings(scores, codes, code_labels):
+    """Precompute the rankings of every combination.
+
+    For each combination this returns the sorted totals (hundredths) of the
+    students who sat all of its subjects, the rows of everyone with at least
+    one subject in ranking order (total, average, subject count, then SBD)
+    and the summary stats for each minimum number of subjects.
+    """
+    rankings, orders, summaries = {}, {}, {}
+    for code, combination in COMBINATIONS.items():
+        totals, counts = combination_totals(combination, scores, codes, code_labels)
+        rankings[code] = np.sort(totals[counts == len(combination.subjects)])
+
+        eligible = np.flatnonzero(counts > 0)
+        eligible_totals = totals[eligible]
+        eligible_counts = counts[eligible]
+        averages = eligible_totals / eligible_counts
+        # Rows are already in SBD order, so the row index breaks the last ties
+        orders[code] = eligible[np.lexsort((eligible, -eligible_counts, -averages, -eligible_totals))].astype(np.int32)
+
+        summaries[code] = {}
+        for min_subjects in range(1, len(combination.subjects) + 1):
+            selected = eligible_counts >= min_subjects
+            summaries[code][str(min_subjects)] = _summary(eligible_totals[selected], averages[selected])
+    return rankings, orders, summaries
+
+
+def _summary(totals: np.ndarray, averages: np.ndarray) -> dict:
+    if not len(totals):
+        return {'total_students': 0, 'highest_total': None, 'lowest_total': None,
+                'average_total': None, 'average_score_mean': None}
+    return {
+        'total_students': int(len(totals)),
+        'highest_total': float(totals.max() / 100),
+        'lowest_total': float(totals.min() / 100),
+        'average_total': float(totals.mean() / 100),
+        'average_score_mean': float(averages.mean() / 100),
+    }
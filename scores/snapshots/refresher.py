@@ -0,0 +1,69 @@
+"""Keep the snapshot current after writes through the API.
+
+A write schedules a rebuild ``SCORE_SNAPSHOT_REBUILD_DELAY`` seconds later
+in a background thread: the writes of a burst share one rebuild, and one
+process at a time builds, under a :class:`ComputeLock` lease.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+
+from .builder import build_snapshot
+from .store import current_snapshot
+
+logger = logging.getLogger(__name__)
+
+REBUILD_LOCK = 'snapshot_rebuild'
+# Longest a rebuild may hold the lease before another process takes over
+REBUILD_LOCK_TIMEOUT = 30 * 60
+
+_pending: Optional[threading.Timer] = None
+_pending_lock = threading.Lock()
+
+
+def schedule_snapshot_rebuild(delay: Optional[float] = None) -> None:
+    """Rebuild the snapshot after *delay* seconds unless this process already plans to.
+
+    A negative ``SCORE_SNAPSHOT_REBUILD_DELAY`` turns automatic rebuilds off.
+    """
+    global _pending
+    delay = settings.SCORE_SNAPSHOT_REBUILD_DELAY if delay is None else delay
+    if delay < 0:
+        return
+    with _pending_lock:
+        if _pending is not None:
+            return
+        _pending = threading.Timer(delay, _rebuild)
+        _pending.daemon = True
+        _pending.start()
+
+
+def _rebuild() -> None:
+    global _pending
+    with _pending_lock:
+        _pending = None
+    # Imported here: the repositories import this package
+    from scores.repositories import ComputeLockRepository, DatasetVersionRepository
+
+    locks = ComputeLockRepository()
+    try:
+        token = locks.acquire(REBUILD_LOCK, REBUILD_LOCK_TIMEOUT)
+        if token is None:
+            # Another process is building; look again once it is likely done
+            schedule_snapshot_rebuild()
+            return
+        try:
+            snapshot = current_snapshot()
+            if snapshot is None or snapshot.dataset_version != DatasetVersionRepository().current():
+                build_snapshot()
+        finally:
+            locks.release(REBUILD_LOCK, token)
+    except Exception:
+        logger.exception("Snapshot rebuild failed")
+    finally:
+        connections.close_all()
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from scores.models import SUBJECT_FIELDS, Combination
+
+SNAPSHOT_FORMAT = 2
+CURRENT_FILE = 'CURRENT'
+META_FILE = 'meta.json'
+# Versions kept on disk; older ones may still be mapped by workers that have
+# not noticed the swap yet, which is harmless on POSIX.
+KEEP_VERSIONS = 2
+
+
+def snapshot_root() -> Path:
+    return Path(settings.SCORE_SNAPSHOT_DIR)
+
+
+def combination_totals(combination: Combination, scores: Dict[str, np.ndarray], codes: np.ndarray,
+                       code_labels: List[str], rows=slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the ``int32`` totals (hundredths) and subject counts of *combination* for *rows*.
+
+    A ``foreign_lang`` score only counts when the student's language is the
+    one required by the combination.
+    """
+    totals = None
+    counts = None
+    for subject in combination.subjects:
+        values = np.asarray(scores[subject][rows])
+        valid = ~np.isnan(values)
+        if subject == 'foreign_lang' and combination.foreign_lang_code is not None:
+            if combination.foreign_lang_code in code_labels:
+                valid &= np.asarray(codes[rows]) == code_labels.index(combination.foreign_lang_code)
+            else:
+                valid[:] = False
+        hundredths = np.where(valid, np.rint(np.nan_to_num(values) * np.float32(100)), 0).astype(np.int32)
+        totals = hundredths if totals is None else totals + hundredths
+        counts = valid.astype(np.int8) if counts is None else counts + valid
+    return totals, counts
+
+
+class ScoreSnapshot:
+    """Read-only, memory-mapped view of one snapshot version.
+
+    ``sbd`` is sorted, and row *i* of every column belongs to ``sbd[i]``.
+    Scores are ``float32`` with ``NaN`` for missing values, and the packed
+    null bitmaps say which rows hold a score.  The arrays are mapped with
+    ``mmap_mode='r'``, so all processes share the same page cache.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / META_FILE, encoding='utf-8') as fh:
+            self.meta = json.load(fh)
+        if self.meta['format'] != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {self.meta['format']}")
+
+        self.version: int = self.meta['version']
+        # The dataset version the rows were read at; *None* for older snapshots
+        self.dataset_version: Optional[int] = self.meta.get('dataset_version')
+        self.rows: int = self.meta['rows']
+        self.sbd = self._load('sbd')
+        self.scores = {subject: self._load(subject) for subject in self.meta['subjects']}
+        self._valid_bits = {subject: self._load(f'{subject}.valid') for subject in self.meta['subjects']}
+        self.codes = self._load('foreign_lang_code')
+        self.code_labels: List[str] = self.meta['foreign_lang_codes']
+        self.rankings = {name: self._load(f'rank_{name}') for name in self.meta.get('rankings', [])}
+        self.orders = {name: self._load(f'order_{name}') for name in self.meta.get('orders', [])}
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(self.path / f'{name}.npy', mmap_mode='r')
+
+    # ------------------------------------------------------------------
+    # Column helpers
+    # ------------------------------------------------------------------
+    def valid(self, subject: str) -> np.ndarray:
+        """Return a boolean mask of the rows that have a *subject* score."""
+        return np.unpackbits(self._valid_bits[subject], count=self.rows).view(bool)
+
+    def hundredths(self, subject: str) -> np.ndarray:
+        """Return *subject* as exact ``int32`` hundredths of a point, ``0`` where missing."""
+        return np.nan_to_num(np.rint(self.scores[subject] * np.float32(100))).astype(np.int32)
+
+    def index_of(self, sbd: str) -> Optional[int]:
+        """Binary-search the sorted SBD index; return the row or *None*."""
+        key = np.bytes_(sbd.encode())
+        row = int(np.searchsorted(self.sbd, key))
+        if row < self.rows and self.sbd[row] == key:
+            return row
+        return None
+
+    def total_standing(self, name: str, total: int) -> Optional[Tuple[int, int, int]]:
+        """Return ``(below, equal, count)`` for a *total* in hundredths, or *None*.
+
+        Two binary searches over the sorted totals stored for *name*.
+        """
+        totals = self.rankings.get(name)
+        if totals is None:
+            return None
+        below = int(np.searchsorted(totals, total, side='left'))
+        not_above = int(np.searchsorted(totals, total, side='right'))
+        return below, not_above - below, len(totals)
+
+    def ranking_order(self, name: str) -> Optional[np.ndarray]:
+        """Rows of the students with at least one subject of *name*, best first."""
+        return self.orders.get(name)
+
+    def ranking_summary(self, name: str, min_subjects: int) -> Optional[dict]:
+        """Aggregate stats of the students with at least *min_subjects* subjects of *name*."""
+        summaries = self.meta.get('summaries', {}).get(name)
+        if summaries is None:
+            return None
+        return summaries.get(str(max(min_subjects, 1)), {
+            'total_students': 0, 'highest_total': None, 'lowest_total': None,
+            'average_total': None, 'average_score_mean': None,
+        })
+
+    def combination_totals(self, combination: Combination, rows) -> Tuple[np.ndarray, np.ndarray]:
+        return combination_totals(combination, self.scores, self.codes, self.code_labels, rows)
+
+    def foreign_lang_code(self, row: int) -> str:
+        return self.code_labels[self.codes[row]]
+
+    def score(self, subject: str, row: int) -> Optional[float]:
+        """Return one score as the original two-decimal value."""
+        value = self.scores[subject][row]
+        return None if np.isnan(value) else round(float(value), 2)
+
+
+# ----------------------------------------------------------------------
+# Publishing
+# ----------------------------------------------------------------------
+def _versions(root: Path) -> List[int]:
+    return sorted(int(p.name[1:]) for p in root.glob('v*') if p.is_dir() and p.name[1:].isdigit())
+
+
+def _write_current(root: Path, name: str) -> None:
+    tmp = root / f'{CURRENT_FILE}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        fh.write(name)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def write_snapshot(columns: Dict[str, np.ndarray], sbd: np.ndarray, codes: np.ndarray,
+                   code_labels: List[str], rankings: Optional[Dict[str, np.ndarray]] = None,
+                   orders: Optional[Dict[str, np.ndarray]] = None,
+                   summaries: Optional[Dict[str, dict]] = None,
+                   dataset_version: Optional[int] = None,
+                   root: Optional[Path] = None) -> ScoreSnapshot:
+    """Write a new snapshot version and atomically make it the current one.
+
+    *rankings* maps a name to the sorted totals used by :meth:`ScoreSnapshot.total_standing`,
+    *orders* to the ranked rows and *summaries* to the per-``min_subjects``
+    stats served by :meth:`ScoreSnapshot.ranking_summary`.
+    """
+    rankings = rankings or {}
+    orders = orders or {}
+    root = Path(root or snapshot_root())
+    root.mkdir(parents=True, exist_ok=True)
+    version = (_versions(root) or [0])[-1] + 1
+    tmp = root / f'.v{version:06d}.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    np.save(tmp / 'sbd.npy', sbd)
+    np.save(tmp / 'foreign_lang_code.npy', codes)
+    for subject in SUBJECT_FIELDS:
+        values = columns[subject]
+        np.save(tmp / f'{subject}.npy', values)
+        np.save(tmp / f'{subject}.valid.npy', np.packbits(~np.isnan(values)))
+    for name, totals in rankings.items():
+        np.save(tmp / f'rank_{name}.npy', totals)
+    for name, rows in orders.items():
+        np.save(tmp / f'order_{name}.npy', rows)
+    with open(tmp / META_FILE, 'w', encoding='utf-8') as fh:
+        json.dump({
+            'format': SNAPSHOT_FORMAT,
+            'version': version,
+            'dataset_version': dataset_version,
+            'rows': int(len(sbd)),
+            'subjects': list(SUBJECT_FIELDS),
+            'foreign_lang_codes': code_labels,
+            'rankings': list(rankings),
+            'orders': list(orders),
+            'summaries': summaries or {},
+        }, fh)
+
+    final = root / f'v{version:06d}'
+    os.replace(tmp, final)
+    _write_current(root, final.name)
+
+    for old in _versions(root)[:-KEEP_VERSIONS]:
+        shutil.rmtree(root / f'v{old:06d}', ignore_errors=True)
+    return ScoreSnapshot(final)
+
+
+def invalidate_snapshot(root: Optional[Path] = None) -> None:
+    """Stop serving the current snapshot (the data has changed since it was built)."""
+    root = Path(root or snapshot_root())
+    if (root / CURRENT_FILE).exists():
+        _write_current(root, '')
+
+
+# ----------------------------------------------------------------------
+# Per-process access
+# ----------------------------------------------------------------------
+_lock = threading.Lock()
+_current: Dict[str, object] = {'name': None, 'snapshot': None}
+
+
+def current_snapshot() -> Optional[ScoreSnapshot]:
+    """Return the current snapshot or *None* if there is no usable one.
+
+    The ``CURRENT`` pointer is re-read on every call, so a swap is picked up
+    by every process on its next request.  After a write the snapshot trails
+    the database until its rebuild is published; compare its
+    ``dataset_version`` with the current one where that matters.
+    """
+    root = snapshot_root()
+    try:
+        name = (root / CURRENT_FILE).read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+    if not name:
+        return None
+
+    with _lock:
+        if _current['name'] != name:
+            try:
+                _current['snapshot'] = ScoreSnapshot(root / name)
+            except (OSError, ValueError, KeyError):
+                _current['snapshot'] = None
+            _current['name'] = name
+        return _current['snapshot']
@@ -1,11 +1,13 @@
 from .student_score_viewset import StudentScoreViewSet
 from .student_score_report_viewset import ScoreReportView
-from .top_student_viewset import TopStudentsGroupAView
+from .top_student_viewset import TopStudentsView
 from .dashboard_viewset import DashboardViewSet
+from .cache_stats_viewset import CacheStatsViewSet
 
 __all__ = [
     'StudentScoreViewSet',
     'ScoreReportView',
-    'TopStudentsGroupAView',
-    'DashboardViewSet'
+    'TopStudentsView',
+    'DashboardViewSet',
+    'CacheStatsViewSet',
 ]
\ No newline at end of file
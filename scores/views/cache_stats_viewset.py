@@ -0,0 +1,11 @@
+from rest_framework import status, viewsets
+from rest_framework.response import Response
+
+from scores.caching import analytics_cache
+
+
+class CacheStatsViewSet(viewsets.ViewSet):
+    """Hit, miss and eviction counters of the analytics cache in the serving worker."""
+
+    def stats(self, request):
+        return Response({"success": True, "data": analytics_cache().stats()}, status=status.HTTP_200_OK)
@@ -1,19 +1,25 @@
+from django.conf import settings
 from rest_framework import status, viewsets
 from rest_framework.response import Response
 
+from scores.caching import conditional_on_dataset, response_store
 from scores.services.dashboard_service import DashboardService
 
 
 class DashboardViewSet(viewsets.ViewSet):
     """API endpoints that power the *dashboard* page."""
 
+    CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", settings.ANALYTICS_CACHE_TIMEOUT)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._service = DashboardService()
 
+    @conditional_on_dataset
     def summary(self, request):
         try:
-            payload = self._service.summary()
-            return Response(payload, status=status.HTTP_200_OK)
+            return response_store().respond(
+                request, "dashboard_summary", (), self._service.summary, timeout=self.CACHE_TIMEOUT,
+            )
         except Exception as exc:
             return Response({"success": False, "error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,55 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from scores.services import StudentScoreService
+
+
+class CachedCountPaginator(Paginator):
+    """Django paginator that takes the total of an unfiltered queryset from the cached student count."""
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, 'query') and not self.object_list.query.has_filters():
+            return StudentScoreService().count()
+        return super().count
+
+
+class ScoreCursorPagination(CursorPagination):
+    """Keyset pages ordered by SBD, so a deep page costs the same as the first."""
+
+    ordering = 'r_number'
+
+    def get_paginated_response(self, data):
+        # Same members, in the same order, as a numbered page
+        return Response({
+            'count': StudentScoreService().count(),
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class ScorePagination(PageNumberPagination):
+    """Numbered pages (``?page=N``), or keyset pages when ``cursor`` is given.
+
+    ``?cursor=`` (empty) starts a keyset walk and every page links to the
+    next one.  In both modes ``count`` is the cached student count, so no
+    request runs ``COUNT(*)`` over the table.
+    """
+
+    django_paginator_class = CachedCountPaginator
+    cursor_query_param = ScoreCursorPagination.cursor_query_param
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_pagination = None
+        if self.cursor_query_param in request.query_params:
+            self.cursor_pagination = ScoreCursorPagination()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -4,7 +4,10 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from django.http import JsonResponse
 
+from scores.caching import conditional_on_dataset, response_store
+from scores.caching.response_store import django_json
 from scores.serializers.student_score_report_serializer import ScoreReportSerializer
+from scores.services.score_statistics import parse_percentiles
 from scores.services.student_score_report_service import ScoreReportService
 
 class ScoreReportView(viewsets.ViewSet):
@@ -15,6 +18,7 @@ class ScoreReportView(viewsets.ViewSet):
         super(ScoreReportView, self).__init__(**kwargs)
         self.service = ScoreReportService()
 
+    @conditional_on_dataset
     def get_report(self, request):
         """
         Generate score statistics report for all subjects
@@ -25,9 +29,10 @@ class ScoreReportView(viewsets.ViewSet):
         - Below Average: < 4 points
         """
         try:
-            response_data = self.service.generate_score_report()
-            serializer = ScoreReportSerializer(response_data)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return response_store().respond(
+                request, 'score_report', (),
+                lambda: ScoreReportSerializer(self.service.generate_score_report()).data,
+            )
 
         except Exception as e:
             return Response({
@@ -35,13 +40,26 @@ class ScoreReportView(viewsets.ViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @conditional_on_dataset
     def get_subject_detail(self, request, subject):
         """
         Get detailed statistics for a specific subject
+        Query parameters:
+        - percentiles: Comma separated percentiles to report (default: 10,25,50,75,90)
         """
         try:
-            response_data = self.service.get_subject_detail(subject)
-            return Response(response_data, status=status.HTTP_200_OK)
+            percentiles = parse_percentiles(request.GET.get('percentiles'))
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            return response_store().respond(
+                request, 'subject_detail', (subject, tuple(percentiles)),
+                lambda: self.service.get_subject_detail(subject, percentiles),
+            )
 
         except Exception as e:
             return Response({
@@ -49,13 +67,16 @@ class ScoreReportView(viewsets.ViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @conditional_on_dataset
     def score_chart_data(self, request):
         """
         Function-based view to return chart-ready data for score statistics
         Optimized for frontend chart libraries
         """
         try:
-            return JsonResponse(self.service.get_score_chart_data())
+            return response_store().respond(
+                request, 'chart_data', (), self.service.get_score_chart_data, render=django_json,
+            )
 
         except Exception as e:
             return JsonResponse({
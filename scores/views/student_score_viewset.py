@@ -1,9 +1,211 @@
-from rest_framework import viewsets
+import uuid
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from scores.caching import conditional_on_dataset
+from scores.exporters import ExportFilter, ScoreExport, cached_columnar_export, gzip_chunks
 from scores.models import StudentScore
-from scores.serializers import StudentScoreSerializer
+from scores.serializers import (
+    RowEncoder, ScoreLookupSerializer, ScoreUpsertRowSerializer, ScoreUpsertSerializer, StudentScoreSerializer,
+)
+from scores.services import StudentScoreService
+from scores.services.student_standing_service import StudentStandingService
+
+from .pagination import ScorePagination
+
+# Found rows are encoded and sent this many at a time
+LOOKUP_BATCH = 500
 
 
 class StudentScoreViewSet(viewsets.ModelViewSet):
     queryset = StudentScore.objects.all().order_by("r_number")
     serializer_class = StudentScoreSerializer
+    pagination_class = ScorePagination
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = StudentScoreService()
+
+    # Reads are answered with 304 while the dataset version is unchanged, and
+    # plain JSON reads skip model instances and the serializer
+    @conditional_on_dataset
+    def list(self, request, *args, **kwargs):
+        if not self._use_row_encoder(request):
+            return super().list(request, *args, **kwargs)
+
+        encoder = self.row_encoder()
+        # Named rows, so cursor pages can read the SBD of the last one
+        rows = self.filter_queryset(self.get_queryset()).values_list(*encoder.sources, named=True)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return self._json_response(f"[{encoder.encode_rows(rows)}]".encode())
+
+        # Render the pagination envelope as usual and fill in its results, its last member
+        envelope = request.accepted_renderer.render(self.get_paginated_response([]).data)
+        if not envelope.endswith(b'[]}'):
+            raise ImproperlyConfigured(
+                f"{type(self.paginator).__name__} must put 'results' last to serve pages through the row encoder"
+            )
+        return self._json_response(b"".join((envelope[:-2], encoder.encode_rows(page).encode(), b"]}")))
+
+    @conditional_on_dataset
+    def retrieve(self, request, *args, **kwargs):
+        if not self._use_row_encoder(request):
+            return super().retrieve(request, *args, **kwargs)
+
+        encoder = self.row_encoder()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.filter_queryset(self.get_queryset()).values_list(*encoder.sources),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        return self._json_response(encoder.encode(row).encode())
+
+    @classmethod
+    def row_encoder(cls) -> RowEncoder:
+        # Built on first use, once the serializer's model fields can be introspected
+        if cls.__dict__.get("_row_encoder") is None:
+            cls._row_encoder = RowEncoder(cls.serializer_class)
+        return cls._row_encoder
+
+    @staticmethod
+    def _use_row_encoder(request) -> bool:
+        """Only compact JSON is row-encoded; the browsable API and ``indent`` go through DRF."""
+        return (
+            settings.SCORES_ROW_ENCODER
+            and type(request.accepted_renderer) is JSONRenderer
+            and request.accepted_media_type == JSONRenderer.media_type
+        )
+
+    @staticmethod
+    def _json_response(body: bytes) -> HttpResponse:
+        return HttpResponse(body, content_type=JSONRenderer.media_type)
+
+    # Writes go through the service so the score histogram stays in sync
+    def perform_create(self, serializer):
+        serializer.instance = self.service.create(serializer.validated_data)
+
+    def perform_update(self, serializer):
+        serializer.instance = self.service.update(serializer.instance.r_number, serializer.validated_data)
+
+    def perform_destroy(self, instance):
+        self.service.delete(instance.r_number)
+
+    @action(detail=True, methods=["get"])
+    @conditional_on_dataset
+    def standing(self, request, pk=None):
+        """Percentile and rank of the student in each subject and in each combination total."""
+        service = StudentStandingService()
+        response = Response(service.standing(pk))
+        if service.provisional:
+            # Ranked against a snapshot that is being rebuilt: an ETag that never
+            # matches, so the client gets the final standings on its next request
+            response["ETag"] = f'"provisional-{uuid.uuid4().hex}"'
+        return response
+
+    @action(detail=False, methods=["get"])
+    @conditional_on_dataset
+    def export(self, request):
+        """
+        Stream every score as CSV (the import file layout) or NDJSON
+        Query parameters:
+        - output: csv (default) or ndjson; ``format`` is reserved by DRF
+        - subject: only students with a score in these subjects (repeat or comma separate)
+        - min_score / max_score: only scores in this range in every given subject
+        - compress: gzip to download a compressed file
+        """
+        subjects = [name for value in request.GET.getlist("subject") for name in value.split(",")]
+        compress = request.GET.get("compress", "")
+        try:
+            export = ScoreExport(request.GET.get("output", "csv"))
+            filters = ExportFilter.parse(subjects, request.GET.get("min_score"), request.GET.get("max_score"))
+            if compress not in ("", "gzip"):
+                raise ValueError("compress must be gzip")
+        except ValueError as e:
+            return Response({"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        chunks, content_type, filename = self.service.export(export, filters), export.content_type, f"scores.{export.output}"
+        if compress:
+            chunks, content_type, filename = gzip_chunks(chunks), "application/gzip", f"{filename}.gz"
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="export/columnar")
+    @conditional_on_dataset
+    def export_columnar(self, request):
+        """Download every score as a binary columnar file (see ``scores.exporters.columnar``).
+
+        The file is built once per dataset version and then served from disk.
+        """
+        path = cached_columnar_export()
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name,
+                            content_type="application/octet-stream")
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create or correct many scores at once: ``{"rows": [{"r_number": ..., "math": ...}, ...]}``.
+
+        Every row is validated on its own; the valid ones are written with
+        one upsert in one transaction, and derived caches are invalidated
+        once for the batch.  ``results`` has one entry per row, in order,
+        whose ``status`` is ``created``, ``updated``, ``unchanged`` or
+        ``invalid`` (with its ``errors``).  Fields a row leaves out keep
+        their stored value.
+        """
+        serializer = ScoreUpsertSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        child = ScoreUpsertRowSerializer()
+        valid, results = [], []
+        for row in serializer.validated_data["rows"]:
+            try:
+                valid.append(child.run_validation(row))
+                results.append({"r_number": valid[-1]["r_number"], "status": None})
+            except serializers.ValidationError as e:
+                sbd = row.get("r_number") if isinstance(row, dict) else None
+                results.append({"r_number": sbd, "status": "invalid", "errors": e.detail})
+
+        outcomes = self.service.upsert_many(valid) if valid else {}
+        summary = dict.fromkeys(("created", "updated", "unchanged", "invalid"), 0)
+        for result in results:
+            if result["status"] is None:
+                result["status"] = outcomes[result["r_number"]]
+            summary[result["status"]] += 1
+        return Response({**summary, "results": results})
+
+    @action(detail=False, methods=["post"])
+    def lookup(self, request):
+        """Scores of many students at once: ``{"sbds": [...]}`` in, ``{"found": [...], "missing": [...]}`` out.
+
+        Found rows come in request order (duplicates once) and are streamed
+        as they are read, so memory stays flat however large the batch.
+        """
+        serializer = ScoreLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        encoder = self.row_encoder()
+        results = self.service.lookup(serializer.validated_data["sbds"], encoder.sources)
+        return StreamingHttpResponse(self._stream_lookup(encoder, results), content_type=JSONRenderer.media_type)
+
+    @staticmethod
+    def _stream_lookup(encoder, results):
+        missing, found, separator = [], [], ""
+        yield '{"found":['
+        for sbd, row in results:
+            if row is None:
+                missing.append(sbd)
+                continue
+            found.append(row)
+            if len(found) == LOOKUP_BATCH:
+                yield separator + encoder.encode_rows(found)
+                found, separator = [], encoder.item_separator
+        if found:
+            yield separator + encoder.encode_rows(found)
+        yield '],"missing":' + JSONRenderer().render(missing).decode() + '}'
@@ -1,36 +1,88 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.urls import reverse
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import status
-from scores.services.cached_top_student_service import CachedTopStudentScoreService
+
+from scores.caching import conditional_on_dataset, response_store
+from scores.models import COMBINATIONS, get_combination
+from scores.services.top_student_service import MAX_PAGE_SIZE, TopStudentScoreService
 
 
-class TopStudentsGroupAView(ViewSet):
+class TopStudentsView(ViewSet):
     """
-    API View to get top 10 students in Group A (Math, Physics, Chemistry)
-    Students are ranked by their total score in these 3 subjects
+    API View to get the top students of one subject combination (khối),
+    e.g. A00 (Math, Physics, Chemistry) or D01 (Literature, Math, English).
+    Students are ranked by their total score in the combination's subjects.
+
+    Rankings are cached as rendered responses in the response store, keyed
+    by the validated query parameters only.
     """
 
+    CACHE_TIMEOUT = getattr(settings, 'TOP_STUDENTS_CACHE_TIMEOUT', settings.ANALYTICS_CACHE_TIMEOUT)
+
     def __init__(self, **kwargs):
-        super(TopStudentsGroupAView, self).__init__(**kwargs)
-        self.service = CachedTopStudentScoreService()
+        super(TopStudentsView, self).__init__(**kwargs)
+        self.service = TopStudentScoreService()
 
-    def get(self, request):
+    @conditional_on_dataset
+    def get(self, request, group):
         """
-        Get top 10 students in Group A subjects
+        Get top students of a combination
         Query parameters:
         - limit: Number of students to return (default: 10, max: 50)
         - min_subjects: Minimum number of subjects student must have scores for (default: 2)
+        - cursor: ``next_cursor`` of the previous page
         """
+        combination = get_combination(group)
+        if combination is None:
+            return Response({
+                'success': False,
+                'error': f'Unknown combination "{group}". Available: {", ".join(COMBINATIONS)}'
+            }, status=status.HTTP_404_NOT_FOUND)
+
         try:
-            limit = int(request.GET.get('limit', 10))
+            limit = max(min(int(request.GET.get('limit', 10)), MAX_PAGE_SIZE), 1)
             min_subjects = int(request.GET.get('min_subjects', 2))
+            if not 0 <= min_subjects <= len(combination.subjects):
+                raise ValueError(f'min_subjects must be between 0 and {len(combination.subjects)}')
+            cursor = request.GET.get('cursor') or None
+            # The code or alias as requested, e.g. ``A00`` or ``GROUP-A``
+            requested = group.upper()
+
+            def ranking():
+                response_data = self.service.rank_students(requested, limit, min_subjects, cursor)
+                next_cursor = response_data['data']['next_cursor']
+                return {**response_data, 'data': {
+                    **response_data['data'],
+                    'next': self._page_url(requested, limit, min_subjects, next_cursor) if next_cursor else None,
+                }}
 
-            response_data = self.service.rank_group_a_students(limit, min_subjects)
+            # Stored bytes are shared by every client: nothing from the Host header or
+            # unvalidated query parameters goes into the key or the body
+            return response_store().respond(
+                request, 'top_students', (requested, limit, min_subjects, cursor or ''), ranking,
+                # A stale page would link to a cursor of the old version, which is rejected
+                timeout=self.CACHE_TIMEOUT, serve_stale=False,
+            )
 
-            return Response(response_data, status=status.HTTP_200_OK)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return Response({
                 'success': False,
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def _page_url(requested: str, limit: int, min_subjects: int, cursor: str) -> str:
+        """Host-relative link to the page at *cursor*."""
+        group = requested if requested in COMBINATIONS else requested.lower()
+        query = urlencode({'limit': limit, 'min_subjects': min_subjects, 'cursor': cursor})
+        return f"{reverse('top_students', kwargs={'group': group})}?{query}"